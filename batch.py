@@ -0,0 +1,203 @@
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from cache import DiskCache
+from picross2d.picross2d import ENCODINGS, export_grid, load_hints, solve_grid, verify_grid
+from picross3d.picross3d import Picross3D
+from portfolio import DEFAULT_PORTFOLIO, parse_configuration, race_file
+from solvers import BACKENDS
+from stats import Stats
+
+
+def expand_paths(patterns):
+    """ Développe les dossiers (tous leurs .txt), les motifs glob et les fichiers donnés en une liste de chemins absolus """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+        else:
+            matches = glob.glob(pattern) or [pattern]
+        paths.extend(os.path.abspath(path) for path in sorted(matches))
+    return paths
+
+
+def puzzle_kind(path):
+    """ '3d' si la première ligne donne les trois dimensions d'un Picross 3D, '2d' sinon """
+    with open(path, "r") as file:
+        first_line = file.readline().split()
+    return "3d" if len(first_line) == 3 else "2d"
+
+
+def solve_puzzle(path, options):
+    """ Résout un puzzle sans affichage et renvoie le résultat (statut, empreinte de la solution, durées) """
+    kind = puzzle_kind(path)
+    if options["portfolio"] is not None:
+        return solve_portfolio(path, kind, options)
+    stats = Stats()
+    cache = None if options["cache"] is None else DiskCache(options["cache"] or None)
+    if kind == "2d":
+        with stats.phase("parse"):
+            rows, cols, row_hints, col_hints = load_hints(path)
+        grid = solve_grid(rows, cols, row_hints, col_hints, options["encoding"], options["propagation"], options["backend"], stats, cache=cache)
+        solution = None if grid is None else "\n".join(grid)
+    else:
+        puzzle = Picross3D(path, propagation=options["propagation"], plain_encoding=options["plain_encoding"], stats=stats, cache=cache)
+        model = puzzle.solve(options["backend"])
+        with stats.decoding():
+            solution = None if model is None else puzzle.decode_solution(model)
+    return {
+        "kind": kind,
+        "status": "unsat" if solution is None else "solved",
+        "solution_sha256": None if solution is None else hashlib.sha256(solution.encode()).hexdigest(),
+        "timings": stats.phases,
+        **({} if cache is None else {"cached": bool(stats.counters["cache_hit"])}),
+        **solution_checks(path, kind, solution, options),
+    }
+
+
+def write_thumbnail(path, kind, solution, options):
+    """ Vignette PNG de la grille 2D résolue dans le dossier options["thumbnails"], s'il est demandé """
+    if options["thumbnails"] is None or kind != "2d" or solution is None:
+        return
+    name = os.path.splitext(os.path.basename(path))[0] + ".png"
+    export_grid(solution.split("\n"), os.path.join(options["thumbnails"], name), options["cell_size"])
+
+
+def verify_solution(path, kind, solution):
+    """ Vérifie d'un coup la solution contre tous les indices du fichier (voir grids) : True si tous sont respectés """
+    from grids import bits_cells, text_cells
+
+    if kind == "2d":
+        _, _, row_hints, col_hints = load_hints(path)
+        rows_ok, cols_ok = verify_grid(text_cells(solution.split("\n")), row_hints, col_hints)
+        return bool(rows_ok.all() and cols_ok.all())
+    puzzle = Picross3D(path, propagation=False)
+    return puzzle.violated_stacks(bits_cells(solution, (puzzle.width, puzzle.height, puzzle.depth))) == 0
+
+
+def solution_checks(path, kind, solution, options):
+    """ Vignette et vérification de la solution demandées par les options ; renvoie les champs à ajouter au résultat """
+    write_thumbnail(path, kind, solution, options)
+    if not options["verify"] or solution is None:
+        return {}
+    return {"verified": verify_solution(path, kind, solution)}
+
+
+def solve_portfolio(path, kind, options):
+    """ Résout un puzzle par une course entre les configurations du portefeuille (voir portfolio.race) """
+    configs = [parse_configuration(text) for text in options["portfolio"] or DEFAULT_PORTFOLIO[kind]]
+    result = race_file(path, kind, configs, options["timeout"], options["propagation"])
+    solution = result.pop("solution")
+    return {
+        "kind": kind,
+        **result,
+        "solution_sha256": None if solution is None else hashlib.sha256(solution.encode()).hexdigest(),
+        **solution_checks(path, kind, solution, options),
+    }
+
+
+def worker(path, options, connection):
+    """ Point d'entrée d'un processus : résout un puzzle et renvoie le résultat par le tube """
+    sys.stdout = open(os.devnull, "w")  # Les messages des solveurs ne doivent pas se mêler au JSONL
+    # Un arrêt pour dépassement de durée doit laisser la course du portefeuille arrêter ses propres processus
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    try:
+        result = solve_puzzle(path, options)
+    except Exception as error:
+        result = {"status": "error", "error": repr(error)}
+    connection.send(result)
+    connection.close()
+
+
+def run_batch(paths, options, workers, timeout, out):
+    """
+    Répartit les puzzles sur au plus workers processus, chacun limité à timeout secondes,
+    et écrit une ligne JSON par puzzle dans out dès qu'il est terminé.
+    """
+    pending = deque(paths)
+    running = {}  # connexion -> (chemin, processus, début)
+    while pending or running:
+        while pending and len(running) < workers:
+            path = pending.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            # Un processus démon ne peut pas lancer les concurrents du portefeuille
+            process = multiprocessing.Process(target=worker, args=(path, options, sender), daemon=options["portfolio"] is None)
+            started = time.perf_counter()
+            process.start()
+            sender.close()
+            running[receiver] = (path, process, started)
+
+        next_deadline = min(started + timeout for _, _, started in running.values())
+        ready = wait(list(running), timeout=max(0.0, next_deadline - time.perf_counter()))
+        now = time.perf_counter()
+        for connection in list(running):
+            path, process, started = running[connection]
+            if connection in ready:
+                try:
+                    result = connection.recv()
+                except EOFError:
+                    result = {"status": "error", "error": f"le processus s'est arrêté (code {process.exitcode})"}
+            elif now - started >= timeout:
+                process.terminate()
+                result = {"status": "timeout"}
+            else:
+                continue
+            process.join()
+            connection.close()
+            del running[connection]
+            out.write(json.dumps({"puzzle": path, **result, "wall_time": now - started}) + "\n")
+            out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résoudre sans affichage un lot de puzzles Picross 2D / 3D en parallèle (sortie JSONL)")
+    parser.add_argument("paths", nargs="+", help="Dossiers, motifs glob ou fichiers de puzzles (ex. data/inputs-2D 'data/inputs-3D/*.txt')")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Durée maximale par puzzle en secondes")
+    parser.add_argument("--output", type=str, default=None, help="Fichier JSONL de sortie (par défaut : sortie standard)")
+    parser.add_argument("--backend", type=str, choices=sorted(BACKENDS), default=None, help="Solveur SAT (par défaut pysat s'il est installé, gophersat sinon)")
+    parser.add_argument("--encoding", type=str, choices=sorted(ENCODINGS), default="dp", help="Encodage des lignes 2D")
+    parser.add_argument("--plain-encoding", type=str, choices=sorted(Picross3D.PLAIN_ENCODINGS), default="ladder", help="Encodage des piles 3D à nombre simple")
+    parser.add_argument("--no-propagation", action="store_true", help="Désactiver la propagation avant le solveur SAT")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="CHEMIN",
+                        help="Cache persistant des solutions partagé par les processus (par défaut : $PICROSS_CACHE ou ~/.cache/picross/solutions.sqlite)")
+    parser.add_argument("--portfolio", nargs="*", default=None, metavar="CONFIG",
+                        help="Course entre configurations encodage[:backend[:graine]][@durée] (sans valeur : portefeuille par défaut)")
+    parser.add_argument("--verify", action="store_true", help="Vérifier chaque solution contre les indices (champ verified)")
+    parser.add_argument("--thumbnails", type=str, default=None, metavar="DOSSIER", help="Écrire une vignette PNG de chaque grille 2D résolue dans ce dossier")
+    parser.add_argument("--cell-size", type=int, default=2, help="Taille des cases des vignettes en pixels")
+    args = parser.parse_args()
+
+    options = {
+        "backend": args.backend,
+        "encoding": args.encoding,
+        "plain_encoding": args.plain_encoding,
+        "propagation": not args.no_propagation,
+        "portfolio": args.portfolio,
+        "cache": args.cache,
+        "timeout": args.timeout,
+        "verify": args.verify,
+        "thumbnails": args.thumbnails,
+        "cell_size": args.cell_size,
+    }
+    if args.thumbnails:
+        os.makedirs(args.thumbnails, exist_ok=True)
+    paths = expand_paths(args.paths)
+    if args.output:
+        with open(args.output, "w") as out:
+            run_batch(paths, options, args.workers, args.timeout, out)
+    else:
+        run_batch(paths, options, args.workers, args.timeout, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+import argparse
+import contextlib
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from generator import format_picross2d, format_picross3d, line_blocks, random_grid, random_voxels
+from picross2d.picross2d import ENCODINGS, ClueEditor, decode_solution, encode_col_constraints, encode_row_constraints, grid_array, load_hints, propagate_lines, solve_grid, stream_grid, verify_grid
+from picross3d.picross3d import Picross3D
+from progressive import follow
+from solvers import BACKENDS, default_backend_name, get_backend, timed_clauses, write_dimacs
+from stats import Stats
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMPORT_MODULES = ["solvers", "picross2d.picross2d", "picross3d.picross3d", "batch"]
+
+
+def import_time(module, top=5):
+    """
+    Coût de démarrage de module, mesuré par python -X importtime dans un interpréteur neuf :
+    durée totale des imports et imports directs de module les plus lents (en microsecondes).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        return {"module": module, "status": "error", "error": result.stderr.strip().splitlines()[-1]}
+    total, direct = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        if name.startswith("   ") and not name.startswith("     "):  # Indentation de deux espaces par niveau
+            direct.append((int(cumulative_us), name.strip()))
+    slowest = [{"module": name, "cumulative_us": us} for us, name in sorted(direct, reverse=True)[:top]]
+    return {"module": module, "status": "ok", "import_us": total, "slowest": slowest}
+
+
+def legacy_scene(plotter, volume):
+    """ Ancien rendu de référence : un acteur pv.Cube par bloc """
+    import pyvista as pv
+
+    for (x, y, z), kept in zip(itertools.product(*map(range, volume.shape)), volume.ravel()):
+        cube = pv.Cube(center=(x, y, z), x_length=1, y_length=1, z_length=1)
+        if kept:
+            plotter.add_mesh(cube, color="green", show_edges=True)
+        else:
+            plotter.add_mesh(cube, color="gray", opacity=0.1, show_edges=True)
+
+
+def merged_scene(plotter, volume):
+    """ Rendu de render_volume : deux maillages fusionnés """
+    from picross3d.picross3d import volume_meshes
+
+    kept, empty = volume_meshes(volume)
+    for mesh, options in ((kept, {"color": "green"}), (empty, {"color": "gray", "opacity": 0.1})):
+        if mesh.n_cells:
+            plotter.add_mesh(mesh, show_edges=True, **options)
+
+
+def render_time(size, density, seed, method):
+    """
+    Rendu hors écran d'un volume aléatoire size x size x size : durées de construction de la scène
+    et de la première image, en secondes.
+    """
+    import numpy as np
+    import pyvista as pv
+
+    volume = np.random.default_rng(seed).random((size, size, size)) < density
+    timings = {}
+    plotter = pv.Plotter(off_screen=True)
+    try:
+        timed(timings, "scene", method, plotter, volume)
+        timed(timings, "first_frame", plotter.screenshot, None, True)
+    finally:
+        plotter.close()
+    return {"size": size, "blocks": volume.size, "timings": timings, "total": sum(timings.values())}
+
+
+def edit_latency(size, seed, edits, density, encoding, backend):
+    """
+    Temps de réponse après chaque modification d'un indice d'une grille aléatoire size x size : une case de la grille
+    de référence est inversée, puis l'indice de sa ligne et celui de sa colonne sont modifiés l'un après l'autre.
+    Chaque modification est résolue par ClueEditor (incrémental) et par solve_grid (reconstruction complète).
+    """
+    import random
+    import statistics
+
+    grid = random_grid(size, size, density, seed)
+    rng = random.Random(seed)
+
+    def hint(line):
+        return " ".join(map(str, line_blocks(line))) or "0"
+
+    row_hints = [hint(row) for row in grid]
+    col_hints = [hint([grid[i][j] for i in range(size)]) for j in range(size)]
+    incremental, rebuild, statuses = [], [], []
+    start = time.perf_counter()
+    with ClueEditor(row_hints, col_hints, encoding, backend) as editor:
+        editor.solve()
+        first = time.perf_counter() - start
+        for _ in range(edits):
+            i, j = rng.randrange(size), rng.randrange(size)
+            grid[i][j] = not grid[i][j]
+            for kind, index, line in (("row", i, grid[i]), ("column", j, [grid[k][j] for k in range(size)])):
+                (row_hints if kind == "row" else col_hints)[index] = hint(line)
+                start = time.perf_counter()
+                editor.set_hint(kind, index, hint(line))
+                solution = editor.solve()
+                incremental.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    expected = solve_grid(size, size, row_hints, col_hints, encoding, True, backend)
+                rebuild.append(time.perf_counter() - start)
+                if (solution is None) != (expected is None):
+                    raise AssertionError(f"statuts différents après modification de {kind} {index}")
+                if solution is not None:
+                    rows_ok, cols_ok = verify_grid(grid_array(solution), row_hints, col_hints)
+                    if not (rows_ok.all() and cols_ok.all()):
+                        raise AssertionError(f"solution incrémentale invalide après modification de {kind} {index}")
+                statuses.append("solved" if solution is not None else "unsat")
+    return {
+        "size": size, "seed": seed, "edits": len(incremental), "solved": statuses.count("solved"), "first_solve": first,
+        "incremental_median": statistics.median(incremental), "incremental_max": max(incremental),
+        "rebuild_median": statistics.median(rebuild), "rebuild_max": max(rebuild),
+        "speedup": statistics.median(rebuild) / statistics.median(incremental),
+    }
+
+
+def progressive_latency(kind, size, seed, density, hidden, encoding, backend):
+    """
+    Résolution progressive d'un puzzle aléatoire : délai avant la première case prouvée, délai avant la solution
+    complète et nombre de cases par source, comparés à la durée d'une résolution classique (solve_grid / solve).
+    """
+    stats = Stats()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if kind == "2d":
+            grid = random_grid(size, size, density, seed)
+            row_hints = [" ".join(map(str, line_blocks(row))) or "0" for row in grid]
+            col_hints = [" ".join(map(str, line_blocks([grid[i][j] for i in range(size)]))) or "0" for j in range(size)]
+            start = time.perf_counter()
+            result = follow(stream_grid(size, size, row_hints, col_hints, encoding, True, backend, stats), lambda cell, black: None)
+            complete = time.perf_counter() - start
+            start = time.perf_counter()
+            solve_grid(size, size, row_hints, col_hints, encoding, True, backend)
+        else:
+            text = format_picross3d(random_voxels(size, size, size, density, seed), size, size, size, hidden, seed)
+            start = time.perf_counter()
+            puzzle = Picross3D.from_text(text, False, encoding, stats)
+            result = follow(puzzle.stream_solution(backend), lambda block, kept: None)
+            complete = time.perf_counter() - start
+            start = time.perf_counter()
+            Picross3D.from_text(text, True, encoding).solve(backend)
+        classic = time.perf_counter() - start
+    return {
+        "kind": kind, "size": size, "seed": seed, "status": "unsat" if result is None else "solved",
+        "first_cell": stats.phases.get("first_cell"), "complete": complete, "classic": classic,
+        **{name: count for name, count in stats.counters.items() if name.endswith("_cells")},
+    }
+
+
+def timed(timings, phase, function, *args):
+    """ Appelle function(*args) en enregistrant sa durée dans timings[phase] """
+    start = time.perf_counter()
+    result = function(*args)
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+def solve_stream(timings, backend, clauses, num_vars):
+    """
+    Résout le flux de clauses sans le rassembler en liste, comme une vraie résolution (le pic mémoire mesuré est
+    celui du flux) : la génération est chronométrée dans le flux et retranchée de la durée de "solve".
+    Renvoie (modèle ou None, nombre de clauses).
+    """
+    solver = get_backend(backend)
+    start = time.perf_counter()
+    solution = solver.solve(timed_clauses(clauses, timings, "generation"), num_vars)
+    timings["solve"] = time.perf_counter() - start - timings["generation"]
+    return solution, solver.num_clauses
+
+
+def serialize(timings, clauses, num_vars):
+    """ Écrit un nouveau flux des clauses au format DIMACS dans un fichier temporaire (sérialisation seule, sans la génération) """
+    generation = {}
+    start = time.perf_counter()
+    with tempfile.TemporaryFile("w") as f:
+        write_dimacs(timed_clauses(clauses, generation, "generation"), f, num_vars)
+    timings["serialization"] = time.perf_counter() - start - generation["generation"]
+
+
+def run_2d(path, case, timings):
+    """ Exécute les phases d'une résolution 2D et renvoie (statut, nombre de clauses, nombre de variables, solution valide) """
+    rows, cols, row_hints, col_hints = timed(timings, "parse", load_hints, path)
+    fixed = {}
+    if case["propagation"]:
+        fixed = timed(timings, "propagation", propagate_lines, rows, cols, row_hints, col_hints)
+        if fixed is None:
+            return "unsat", 0, 0, None
+
+    def clauses(aux_counter):
+        for v, black in fixed.items():
+            yield [v if black else -v]
+        yield from encode_row_constraints(rows, cols, row_hints, aux_counter, case["encoding"], fixed)
+        yield from encode_col_constraints(rows, cols, col_hints, aux_counter, case["encoding"], fixed)
+
+    aux_counter = [rows * cols]
+    solution, num_clauses = solve_stream(timings, case["backend"], clauses(aux_counter), rows * cols)
+    serialize(timings, clauses([rows * cols]), aux_counter[0])
+    if solution is None:
+        return "unsat", num_clauses, aux_counter[0], None
+    timed(timings, "import", importlib.import_module, "grids")  # NumPy est chargé hors de la phase "decode"
+    grid = timed(timings, "decode", decode_solution, solution, rows, cols)
+    with open(path) as f:
+        valid = format_picross2d([[cell == "X" for cell in row] for row in grid]) == f.read()
+    return "solved", num_clauses, aux_counter[0], valid
+
+
+def run_3d(path, case, timings):
+    """ Exécute les phases d'une résolution 3D et renvoie (statut, nombre de clauses, nombre de variables, solution valide) """
+    puzzle = timed(timings, "parse", Picross3D, path, False, case["plain_encoding"])
+    if case["propagation"]:
+        puzzle.fixed = timed(timings, "propagation", puzzle.propagate)
+        if puzzle.fixed is None:
+            return "unsat", 0, 0, None
+
+    first_variable = puzzle.numLiterals  # Les variables auxiliaires sont recréées à chaque flux
+    solution, num_clauses = solve_stream(timings, case["backend"], puzzle.generate_constraints(), first_variable - 1)
+    num_vars = puzzle.numLiterals - 1
+    puzzle.numLiterals = first_variable
+    serialize(timings, puzzle.generate_constraints(), num_vars)
+    if solution is None:
+        return "unsat", num_clauses, num_vars, None
+    timed(timings, "import", importlib.import_module, "grids")  # NumPy est chargé hors de la phase "decode"
+    bits = timed(timings, "decode", puzzle.decode_solution, solution)
+
+    # La solution doit respecter tous les indices affichés du puzzle
+    voxels = {(x, y, z) for (x, y, z), index in puzzle.indices.items() if bits[index - 1] == "1"}
+    expected = format_picross3d(voxels, puzzle.width, puzzle.height, puzzle.depth).split()
+    with open(path) as f:
+        given = f.read().split()
+    valid = len(expected) == len(given) and all(g == "-" or g == e for g, e in zip(given, expected))
+    return "solved", num_clauses, num_vars, valid
+
+
+def run_case(path, case):
+    """ Point d'entrée d'un processus de mesure : un cas par processus pour que le pic mémoire lui soit propre """
+    sys.stdout = open(os.devnull, "w")
+    timings = {}
+    run = run_2d if case["kind"] == "2d" else run_3d
+    status, num_clauses, num_vars, valid = run(path, case, timings)
+    return {
+        "status": status,
+        "valid": valid,
+        "clauses": num_clauses,
+        "variables": num_vars,
+        "timings": timings,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def generate_puzzle(case, directory):
+    """ Écrit le puzzle aléatoire décrit par case dans directory et renvoie son chemin """
+    size, seed, density = case["size"], case["seed"], case["density"]
+    if case["kind"] == "2d":
+        text = format_picross2d(random_grid(size, size, density, seed))
+    else:
+        text = format_picross3d(random_voxels(size, size, size, density, seed), size, size, size, case["hidden"], seed)
+    path = os.path.join(directory, f"{case['kind']}_{size}_{seed}.txt")
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+def benchmark_cases(args):
+    """ Produit toutes les combinaisons de paramètres demandées """
+    for kind, size, seed, backend, propagation in itertools.product(args.kinds, args.sizes, args.seeds, args.backends, args.propagation):
+        encodings = args.encodings if kind == "2d" else args.plain_encodings
+        for encoding in encodings:
+            yield {
+                "kind": kind, "size": size, "seed": seed, "density": args.density, "hidden": args.hidden,
+                "backend": backend, "propagation": propagation == "on",
+                "encoding": encoding if kind == "2d" else None,
+                "plain_encoding": encoding if kind == "3d" else None,
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesurer les performances des solveurs sur des puzzles aléatoires (sortie JSONL)")
+    parser.add_argument("--kinds", nargs="+", choices=["2d", "3d"], default=["2d", "3d"], help="Types de puzzles")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 25, 50], help="Tailles N (grilles N x N, cubes N x N x N)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0], help="Graines du générateur")
+    parser.add_argument("--density", type=float, default=0.5, help="Proportion de cases / blocs pleins")
+    parser.add_argument("--hidden", type=float, default=0.0, help="Proportion d'indices 3D masqués")
+    parser.add_argument("--encodings", nargs="+", choices=sorted(ENCODINGS), default=["dp"], help="Encodages des lignes 2D")
+    parser.add_argument("--plain-encodings", nargs="+", choices=sorted(Picross3D.PLAIN_ENCODINGS), default=["ladder"], help="Encodages des piles 3D simples")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=[default_backend_name()], help="Solveurs SAT")
+    parser.add_argument("--propagation", nargs="+", choices=["on", "off"], default=["off"], help="Avec et / ou sans propagation")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Durée maximale par cas en secondes")
+    parser.add_argument("--output", type=str, default=None, help="Fichier JSONL de sortie (par défaut : sortie standard)")
+    parser.add_argument("--import-time", action="store_true", help="Mesurer seulement le temps d'import des modules du solveur (python -X importtime)")
+    parser.add_argument("--edits", type=int, default=None, metavar="N", help="Mesurer seulement le temps de réponse de N modifications d'indices 2D (incrémental contre reconstruction complète)")
+    parser.add_argument("--render", action="store_true", help="Mesurer seulement le rendu 3D hors écran de volumes aléatoires de taille --sizes")
+    parser.add_argument("--progressive", action="store_true", help="Mesurer seulement la résolution progressive : délai avant la première case prouvée et avant la solution complète, contre une résolution classique")
+    parser.add_argument("--render-legacy-max", type=int, default=12, help="Taille maximale mesurée avec l'ancien rendu (un cube par bloc)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    if args.import_time:
+        for module in IMPORT_MODULES:
+            out.write(json.dumps(import_time(module)) + "\n")
+        if out is not sys.stdout:
+            out.close()
+        return
+    if args.edits:
+        for size, seed, backend, encoding in itertools.product(args.sizes, args.seeds, args.backends, args.encodings):
+            result = edit_latency(size, seed, args.edits, args.density, encoding, backend)
+            out.write(json.dumps({"backend": backend, "encoding": encoding, **result}) + "\n")
+            out.flush()
+        if out is not sys.stdout:
+            out.close()
+        return
+    if args.progressive:
+        for kind, size, seed, backend in itertools.product(args.kinds, args.sizes, args.seeds, args.backends):
+            encodings = args.encodings if kind == "2d" else args.plain_encodings
+            for encoding in encodings:
+                result = progressive_latency(kind, size, seed, args.density, args.hidden, encoding, backend)
+                out.write(json.dumps({"backend": backend, "encoding": encoding, **result}) + "\n")
+                out.flush()
+        if out is not sys.stdout:
+            out.close()
+        return
+    if args.render:
+        for size, seed in itertools.product(args.sizes, args.seeds):
+            methods = [("merged", merged_scene)] + ([("legacy", legacy_scene)] if size <= args.render_legacy_max else [])
+            for name, method in methods:
+                out.write(json.dumps({"render": name, "seed": seed, **render_time(size, args.density, seed, method)}) + "\n")
+                out.flush()
+        if out is not sys.stdout:
+            out.close()
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        for case in benchmark_cases(args):
+            path = generate_puzzle(case, directory)
+            pool = multiprocessing.Pool(processes=1, maxtasksperchild=1)
+            try:
+                result = pool.apply_async(run_case, (path, case)).get(args.timeout)
+            except multiprocessing.TimeoutError:
+                result = {"status": "timeout"}
+            except Exception as error:
+                result = {"status": "error", "error": repr(error)}
+            finally:
+                pool.terminate()
+                pool.join()
+            out.write(json.dumps({**case, **result}) + "\n")
+            out.flush()
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+# À incrémenter quand un encodage change de résultat : les solutions enregistrées auparavant sont alors ignorées
+ENCODING_VERSION = 1
+
+
+def default_cache_path():
+    """ Base de données du cache : $PICROSS_CACHE, sinon ~/.cache/picross/solutions.sqlite """
+    return os.environ.get("PICROSS_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "picross", "solutions.sqlite")
+
+
+def canonical_2d(rows, cols, row_hints, col_hints):
+    """ Forme normalisée d'une grille 2D : espaces et indices "0" n'en changent pas la clé """
+    def blocks(hint):
+        return [block for block in map(int, hint.split()) if block]
+
+    return {"kind": "2d", "size": [rows, cols], "rows": [blocks(h) for h in row_hints], "cols": [blocks(h) for h in col_hints]}
+
+
+def canonical_3d(width, height, depth, sides):
+    """ Forme normalisée d'un puzzle 3D : dimensions et indices des trois faces """
+    return {"kind": "3d", "size": [width, height, depth], "sides": [sides[side] for side in range(3)]}
+
+
+def cache_key(canonical):
+    """ Empreinte SHA-256 d'une forme normalisée et de la version des encodages """
+    data = json.dumps({**canonical, "version": ENCODING_VERSION}, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def puzzle_key(kind, text):
+    """ Empreinte d'un puzzle donné par le contenu de son fichier """
+    if kind == "2d":
+        from picross2d.picross2d import parse_hints
+
+        return cache_key(canonical_2d(*parse_hints(text)))
+    from picross3d.picross3d import Picross3D
+
+    return cache_key(canonical_3d(*Picross3D.parse_picross3d(text)))
+
+
+class MemoryCache:
+    """ Résultats récents en mémoire, le moins récemment utilisé étant évincé au-delà de size entrées """
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+class DiskCache:
+    """
+    Solutions (ou verdicts UNSAT) enregistrées dans une base SQLite partagée par tous les processus.
+    SQLite sérialise les écritures concurrentes ; au-delà de max_entries, les entrées les moins récemment
+    utilisées sont évincées. hits et misses comptent les consultations du processus courant.
+    """
+
+    def __init__(self, path=None, max_entries=10000):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)")
+
+    def get(self, key):
+        """ Résultat enregistré ({"status": ..., "solution": ...}) ou None ; une consultation réussie rafraîchit l'entrée """
+        row = self.connection.execute("SELECT value FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE solutions SET used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (key, json.dumps(value), time.time()))
+            self.connection.execute(
+                "DELETE FROM solutions WHERE key IN (SELECT key FROM solutions ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
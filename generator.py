@@ -0,0 +1,90 @@
+import argparse
+import random
+
+
+def line_blocks(line):
+    """ Longueurs des groupes de cases pleines d'une ligne """
+    blocks = []
+    run = 0
+    for cell in list(line) + [False]:
+        if cell:
+            run += 1
+        elif run:
+            blocks.append(run)
+            run = 0
+    return blocks
+
+
+def random_grid(rows, cols, density=0.5, seed=None):
+    """ Grille aléatoire de rows x cols cases, chaque case étant pleine avec la probabilité density """
+    rng = random.Random(seed)
+    return [[rng.random() < density for _ in range(cols)] for _ in range(rows)]
+
+
+def format_picross2d(grid):
+    """ Indices d'une grille au format des fichiers de data/inputs-2D """
+    rows, cols = len(grid), len(grid[0])
+    lines = [str(rows), str(cols)]
+    for row in grid:
+        lines.append(" ".join(map(str, line_blocks(row))) or "0")
+    for j in range(cols):
+        lines.append(" ".join(map(str, line_blocks([grid[i][j] for i in range(rows)]))) or "0")
+    return "\n".join(lines) + "\n"
+
+
+def random_voxels(width, height, depth, density=0.5, seed=None):
+    """ Forme aléatoire : ensemble des blocs (x, y, z) présents, chacun avec la probabilité density """
+    rng = random.Random(seed)
+    return {(x, y, z) for x in range(width) for y in range(height) for z in range(depth) if rng.random() < density}
+
+
+def stack_clue(stack):
+    """ Indice Picross 3D d'une pile : nombre simple (1 groupe), cerclé (2 groupes) ou carré (3 groupes ou plus) """
+    blocks = line_blocks(stack)
+    count = sum(blocks)
+    if len(blocks) <= 1:
+        return str(count)
+    return f"({count})" if len(blocks) == 2 else f"[{count}]"
+
+
+def format_picross3d(voxels, width, height, depth, hidden=0.0, seed=None):
+    """
+    Indices d'une forme au format des fichiers de data/inputs-3D (faces 0, 1 et 2, dans l'ordre de Picross3D.get_stack_of_blocks).
+    Chaque indice est remplacé par '-' avec la probabilité hidden.
+    """
+    rng = random.Random(seed)
+
+    def clue(stack):
+        return "-" if rng.random() < hidden else stack_clue(stack)
+
+    side0 = [[clue([(x, y, z) in voxels for x in range(width)]) for z in range(depth)] for y in range(height)]
+    side1 = [[clue([(width - row - 1, y, z) in voxels for y in range(height)]) for z in range(depth)] for row in range(width)]
+    side2 = [[clue([(width - col - 1, y, z) in voxels for z in range(depth)]) for col in range(width)] for y in range(height)]
+
+    parts = [f"{width} {height} {depth}"]
+    for side in (side0, side1, side2):
+        parts.append("\n".join(" ".join(row) for row in side))
+    return "\n\n".join(parts) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générer un puzzle Picross 2D ou 3D aléatoire")
+    parser.add_argument("kind", choices=["2d", "3d"], help="Type de puzzle")
+    parser.add_argument("size", type=int, help="Taille : grille size x size (2D) ou cube size x size x size (3D)")
+    parser.add_argument("--density", type=float, default=0.5, help="Proportion de cases / blocs pleins")
+    parser.add_argument("--hidden", type=float, default=0.0, help="Proportion d'indices 3D masqués ('-')")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    parser.add_argument("--output", type=str, required=True, help="Fichier de sortie")
+    args = parser.parse_args()
+
+    if args.kind == "2d":
+        text = format_picross2d(random_grid(args.size, args.size, args.density, args.seed))
+    else:
+        voxels = random_voxels(args.size, args.size, args.size, args.density, args.seed)
+        text = format_picross3d(voxels, args.size, args.size, args.size, args.hidden, args.seed)
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main()
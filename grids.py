@@ -0,0 +1,113 @@
+import os
+import struct
+
+import numpy as np
+
+# Représentation commune des solutions : tableau NumPy de booléens (lignes x colonnes en 2D, x, y, z en 3D),
+# True pour une case noire / un bloc gardé. Les variables SAT des cases sont 1..nombre de cases dans cet ordre.
+
+PACKED_MAGIC = b"PCRB"  # En-tête des fichiers .bits : magic, nombre de dimensions (uint8), dimensions (uint32), bits
+
+
+def model_cells(model, shape):
+    """ Décode un modèle SAT (liste de littéraux) en tableau de booléens de forme shape, sans boucle Python """
+    num_cells = int(np.prod(shape))
+    literals = np.asarray(model, dtype=np.int64)
+    positive = literals[(literals > 0) & (literals <= num_cells)]
+    cells = np.zeros(num_cells + 1, dtype=bool)
+    cells[positive] = True
+    return cells[1:].reshape(shape)
+
+
+def text_cells(lines, filled="X"):
+    """ Lignes de texte de même longueur (chaînes ou listes de caractères) en tableau de booléens """
+    text = "".join("".join(line) for line in lines).encode()
+    width = len(lines[0]) if len(lines) else 0  # Forme explicite : reshape(-1) est ambigu pour une grille vide
+    return (np.frombuffer(text, dtype=np.uint8) == ord(filled)).reshape(len(lines), width)
+
+
+def cells_text(cells, filled="X", empty="."):
+    """ Inverse de text_cells : une chaîne par ligne du tableau 2D """
+    chars = np.where(cells, ord(filled), ord(empty)).astype(np.uint8)
+    data = chars.tobytes().decode()
+    width = cells.shape[1]
+    if width == 0:
+        return [""] * cells.shape[0]  # Grille sans colonne
+    return [data[i:i + width] for i in range(0, len(data), width)]
+
+
+def cells_bits(cells):
+    """ Chaîne de '0' / '1', un caractère par case dans l'ordre du tableau (x, y, z en 3D) """
+    return np.where(cells, ord("1"), ord("0")).astype(np.uint8).tobytes().decode()
+
+
+def bits_cells(bits, shape):
+    """ Inverse de cells_bits """
+    return (np.frombuffer(bits.encode(), dtype=np.uint8) == ord("1")).reshape(shape)
+
+
+def line_runs(lines):
+    """
+    Groupes de cases pleines de toutes les lignes d'un tableau (lignes le long du dernier axe) en une passe :
+    renvoie (numéro de ligne à plat de chaque groupe, longueur de chaque groupe), dans l'ordre des lignes.
+    """
+    length = lines.shape[-1]
+    flat = lines.reshape(-1, length)
+    padded = np.zeros((flat.shape[0], length + 2), dtype=np.int8)  # Une case vide de chaque côté de chaque ligne
+    padded[:, 1:-1] = flat
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts // (length + 2), ends - starts
+
+
+def check_runs(lines, clues):
+    """
+    Vérifie toutes les lignes à la fois contre leurs indices (listes de longueurs de blocs, [] pour une ligne vide) :
+    renvoie un tableau de booléens, True pour une ligne respectée.
+    """
+    num_lines = int(np.prod(lines.shape[:-1]))
+    line, runs = line_runs(lines)
+    expected_line = np.repeat(np.arange(num_lines), [len(clue) for clue in clues])
+    expected_runs = np.fromiter((block for clue in clues for block in clue), dtype=np.int64, count=len(expected_line))
+    ok = np.bincount(line, minlength=num_lines) == np.bincount(expected_line, minlength=num_lines)
+    # Sur les lignes qui ont le bon nombre de groupes, les groupes observés et attendus sont alignés un à un
+    kept, expected_kept = ok[line], ok[expected_line]
+    wrong = line[kept][runs[kept] != expected_runs[expected_kept]]
+    ok[wrong] = False
+    return ok.reshape(lines.shape[:-1])
+
+
+def line_counts(lines):
+    """ Nombre de cases pleines et nombre de groupes de chaque ligne (le long du dernier axe) """
+    filled = lines.sum(axis=-1)
+    starts = lines[..., 0].astype(np.int64) + (lines[..., 1:] & ~lines[..., :-1]).sum(axis=-1)
+    return filled, starts
+
+
+def save_cells(cells, filename):
+    """ Enregistre un tableau de booléens en .npy, ou en .bits (8 cases par octet, voir PACKED_MAGIC) """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".npy":
+        np.save(filename, cells)
+    elif extension == ".bits":
+        with open(filename, "wb") as file:
+            file.write(PACKED_MAGIC + struct.pack(f"<B{cells.ndim}I", cells.ndim, *cells.shape))
+            file.write(np.packbits(cells, axis=None).tobytes())
+    else:
+        raise ValueError(f"Format non pris en charge : {filename} (.npy ou .bits)")
+
+
+def load_cells(filename):
+    """ Relit un tableau enregistré par save_cells """
+    if os.path.splitext(filename)[1].lower() == ".npy":
+        return np.load(filename)
+    with open(filename, "rb") as file:
+        data = file.read()
+    if data[:len(PACKED_MAGIC)] != PACKED_MAGIC:
+        raise ValueError(f"{filename} n'est pas un fichier .bits")
+    ndim = data[len(PACKED_MAGIC)]
+    header = len(PACKED_MAGIC) + 1 + 4 * ndim
+    shape = struct.unpack(f"<{ndim}I", data[len(PACKED_MAGIC) + 1:header])
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=header), count=int(np.prod(shape)))
+    return bits.astype(bool).reshape(shape)
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+from batch import expand_paths
+from service import DEFAULT_SOCKET, request
+
+
+def percentile(values, fraction):
+    """ Valeur au rang fraction (0 à 1) des valeurs triées """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else None
+
+
+async def load_test(puzzles, total, concurrency, socket_path, port, timeout, use_cache=True):
+    """ Envoie total requêtes au service, au plus concurrency à la fois, et mesure débit et latences """
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = Counter()
+    cached = 0
+
+    async def one(index):
+        nonlocal cached
+        async with slots:
+            start = time.perf_counter()
+            message = {"status": "error"}
+            async for message in request({"puzzle": puzzles[index % len(puzzles)], "timeout": timeout, "cache": use_cache}, socket_path, port):
+                pass
+            latencies.append(time.perf_counter() - start)
+            statuses[message["status"]] += 1
+            cached += bool(message.get("cached"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "throughput": total / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies),
+        "statuses": dict(statuses),
+        "cached": cached,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service de résolution (débit et latence p99)")
+    parser.add_argument("paths", nargs="*", default=["data/inputs-2D", "data/inputs-3D"], help="Dossiers, motifs glob ou fichiers de puzzles envoyés à tour de rôle")
+    parser.add_argument("--requests", type=int, default=200, help="Nombre total de requêtes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Nombre de requêtes simultanées")
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Socket Unix du service")
+    parser.add_argument("--port", type=int, default=None, help="Port TCP du service sur 127.0.0.1")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Échéance de chaque tâche en secondes")
+    parser.add_argument("--no-cache", action="store_true", help="Résoudre chaque requête sans consulter le cache du service")
+    args = parser.parse_args()
+
+    puzzles = []
+    for path in expand_paths(args.paths):
+        with open(path, "r") as file:
+            puzzles.append(file.read())
+    result = asyncio.run(load_test(puzzles, args.requests, args.concurrency, args.socket, args.port, args.timeout, not args.no_cache))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
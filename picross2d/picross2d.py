@@ -1,36 +1,62 @@
+import itertools
 import sys
-import tkinter as tk
 import time
 import os
-import subprocess
-from typing import List
-from constraint import Problem, ExactSumConstraint
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from config import DATA_DIR
 from config import INPUTS_2D
+from cache import DiskCache, cache_key, canonical_2d
+from progressive import DEFAULT_BUDGET, background, drain, follow, stream_cells
+from propagation import nonogram_automaton, propagate
+from solvers import BACKENDS, BackendChoice, get_backend
+from stats import NULL_STATS, Stats, profiled
 import argparse
 
 
 def load_hints(filename):
     with open(filename, "r") as file:
-        lines = [line.strip() for line in file.readlines()]
-    
+        return parse_hints(file.read())
+
+def parse_hints(text):
+    """ Lit les dimensions et les indices d'une grille au format de data/inputs-2D """
+    lines = [line.strip() for line in text.splitlines()]
+
     rows = int(lines[0])
     cols = int(lines[1])
     row_hints = lines[2:2+rows]
     col_hints = lines[2+rows:2+rows+cols]
     return rows, cols, row_hints, col_hints
 
+def format_hint(hint: Union[str, Sequence[int]]) -> str:
+    """ Indice au format des fichiers ("1 2") à partir d'une chaîne ou d'une liste de longueurs de blocs """
+    return hint if isinstance(hint, str) else " ".join(map(str, hint)) or "0"
+
 def load_grid(filename):
     with open(filename, "r") as file:
         return [list(line.strip()) for line in file.readlines()]
 
-def draw_nonogram(root, grid_filename: str, hints_filename: str):
-    grid = load_grid(grid_filename)
-    rows, cols, row_hints, col_hints = load_hints(hints_filename)
-    cell_size = 18  # Taille des cases
-    offset_x = 50  # Décalage pour la grille
-    offset_y = 50  # Décalage pour la grille
+def grid_runs(grid) -> Iterator[Tuple[int, int, int]]:
+    """ Blocs noirs de la grille, ligne par ligne : (ligne, première colonne, colonne après le bloc) """
+    for i, row in enumerate(grid):
+        j = 0
+        for filled, run in itertools.groupby(row, key=lambda cell: cell == 'X'):
+            length = len(list(run))
+            if filled:
+                yield i, j, j + length
+            j += length
+
+ANIMATION_CHUNK = 0.015  # Durée maximale (en secondes) de dessin entre deux passages de la boucle d'événements Tk
+CELL_SIZE = 18  # Taille des cases
+GRID_OFFSET = 50  # Décalage pour la grille
+
+def nonogram_canvas(root, rows: int, cols: int, row_hints: List[str], col_hints: List[str]):
+    """ Canevas Tk avec le quadrillage vide de la grille et ses indices """
+    import tkinter as tk  # Import paresseux : seul l'affichage a besoin de Tk
+    cell_size = CELL_SIZE
+    offset_x = GRID_OFFSET
+    offset_y = GRID_OFFSET
     
     canvas = tk.Canvas(root, width=offset_x + cols * cell_size + 50, height=offset_y + rows * cell_size + 50)
     canvas.pack()
@@ -45,33 +71,138 @@ def draw_nonogram(root, grid_filename: str, hints_filename: str):
     for i, hint in enumerate(row_hints):
         canvas.create_text(offset_x + cols * cell_size + 10, offset_y + i * cell_size + cell_size // 2, text=hint, anchor='w', font=('Arial', 6))
     
-    # Afficher les indices des colonnes en bas
+    # Afficher les indices des colonnes en bas, un nombre par ligne de texte
     for j, hint in enumerate(col_hints):
-        hint_numbers = hint.split()  # Séparer les nombres
-        for k, number in enumerate(hint_numbers):
-            canvas.create_text(
-                offset_x + j * cell_size + cell_size // 2, 
-                offset_y + rows * cell_size + 10 + k * 8,  # Décalage progressif vers le bas
-                text=number, 
-                anchor='n', 
-                font=('Arial', 6)
-            )
-
-    # Fonction pour colorier progressivement les cases
+        canvas.create_text(
+            offset_x + j * cell_size + cell_size // 2,
+            offset_y + rows * cell_size + 10,
+            text="\n".join(hint.split()),
+            anchor='n',
+            font=('Arial', 6)
+        )
+    return canvas
+
+def draw_nonogram(root, grid_filename: str, hints_filename: str, animate: bool = False):
+    """
+    Dessine la grille résolue et ses indices. Chaque bloc noir d'une ligne est un seul rectangle.
+    Avec animate, les blocs sont dessinés par tranches d'ANIMATION_CHUNK planifiées par root.after : la fenêtre reste réactive.
+    """
+    grid = load_grid(grid_filename)
+    rows, cols, row_hints, col_hints = load_hints(hints_filename)
+    canvas = nonogram_canvas(root, rows, cols, row_hints, col_hints)
+    cell_size = CELL_SIZE
+    offset_x = GRID_OFFSET
+    offset_y = GRID_OFFSET
+
+    runs = grid_runs(grid)
+
+    def fill_run(i, start, end):
+        canvas.create_rectangle(
+            offset_x + start * cell_size, offset_y + i * cell_size,
+            offset_x + end * cell_size, offset_y + (i + 1) * cell_size,
+            fill='black'
+        )
+
+    if not animate:
+        for run in runs:
+            fill_run(*run)
+        return
+
+    # Coloriage progressif : chaque tranche rend la main à la boucle d'événements sans jamais dormir
     def animate_fill():
-        for i in range(rows):
-            for j in range(cols):
-                if grid[i][j] == 'X':
-                    canvas.create_rectangle(
-                        offset_x + j * cell_size, offset_y + i * cell_size,
-                        offset_x + (j + 1) * cell_size, offset_y + (i + 1) * cell_size,
-                        fill='black'
-                    )
-                    root.update()
-                    time.sleep(0.005)
-    
+        deadline = time.perf_counter() + ANIMATION_CHUNK
+        for run in runs:
+            fill_run(*run)
+            if time.perf_counter() >= deadline:
+                root.after(1, animate_fill)
+                return
+
     root.after(100, animate_fill)
 
+STREAM_POLL_MS = 20  # Intervalle (en millisecondes) entre deux relevés des cases prouvées
+
+def draw_stream(root, rows: int, cols: int, row_hints: List[str], col_hints: List[str], events, on_done=None):
+    """
+    Dessine en direct un flux de résolution progressive (voir stream_grid) : le flux est consommé dans un thread,
+    et la boucle d'événements Tk relève les cases prouvées toutes les STREAM_POLL_MS (noires pleines, blanches
+    marquées d'un point gris). on_done(grille) est appelé dans la boucle Tk à la fin du flux.
+    """
+    canvas = nonogram_canvas(root, rows, cols, row_hints, col_hints)
+    updates = background(events)
+
+    def fill_cell(i, j, black):
+        x, y = GRID_OFFSET + j * CELL_SIZE, GRID_OFFSET + i * CELL_SIZE
+        if black:
+            canvas.create_rectangle(x, y, x + CELL_SIZE, y + CELL_SIZE, fill='black')
+        else:
+            canvas.create_oval(x + CELL_SIZE // 2 - 1, y + CELL_SIZE // 2 - 1, x + CELL_SIZE // 2 + 1, y + CELL_SIZE // 2 + 1, fill='gray', outline='gray')
+
+    def poll():
+        for cell, value in drain(updates, ANIMATION_CHUNK):
+            if cell is None:
+                if on_done is not None:
+                    on_done(value)
+                return
+            fill_cell(*cell, value)
+        root.after(STREAM_POLL_MS, poll)
+
+    root.after(0, poll)
+
+def grid_array(grid):
+    """ Grille (chaînes ou listes de caractères) sous forme de tableau NumPy de booléens, True pour les cases noires """
+    from grids import text_cells  # Import paresseux : NumPy n'est chargé qu'à la première grille décodée
+
+    return text_cells(grid, 'X')
+
+def grid_image(cells, cell_size: int = 8):
+    """
+    Image RGB (tableau uint8 hauteur x largeur x 3) d'un tableau de booléens : cases noires sur fond blanc,
+    séparées par des traits gris quand les cases font au moins 4 pixels.
+    """
+    import numpy as np
+
+    rows, cols = cells.shape
+    image = np.full((rows * cell_size + 1, cols * cell_size + 1, 3), 255, dtype=np.uint8)
+    pixels = np.repeat(np.repeat(cells, cell_size, axis=0), cell_size, axis=1)
+    image[:-1, :-1][pixels] = 0
+    if cell_size >= 4:
+        image[::cell_size] = 128
+        image[:, ::cell_size] = 128
+    return image
+
+def write_image(image, filename: str) -> None:
+    """ Écrit une image RGB uint8 en PNG ou en PPM binaire (selon l'extension), sans autre dépendance que NumPy """
+    import struct
+    import zlib
+
+    height, width, _ = image.shape
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".ppm":
+        data = f"P6\n{width} {height}\n255\n".encode() + image.tobytes()
+    elif extension == ".png":
+        def chunk(kind: bytes, payload: bytes) -> bytes:
+            return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+        import numpy as np
+
+        scanlines = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)], axis=1)  # Filtre 0 par ligne
+        data = (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)) + chunk(b"IEND", b""))
+    else:
+        raise ValueError(f"Format d'image non pris en charge : {filename} (.png ou .ppm)")
+    with open(filename, "wb") as file:
+        file.write(data)
+
+def export_grid(grid, filename: str, cell_size: int = 8) -> None:
+    """ Enregistre la grille résolue en image PNG / PPM sans Tk (vignettes des traitements par lots) """
+    write_image(grid_image(grid_array(grid), cell_size), filename)
+
+def export_solution(grid: Optional[List[str]], filename: str, cell_size: int = 8) -> None:
+    """ --export : enregistre la grille résolue, ou quitte en erreur sans rien écrire si la grille n'a pas de solution """
+    if grid is None:
+        sys.exit(f"error: no solution found, {filename} not written")
+    export_grid(grid, filename, cell_size)
+
 # function to solve the nonogram
 def var(i: int, j: int, cols: int) -> int:
     return i * cols + j + 1
@@ -80,163 +211,626 @@ def aux_var(counter: List[int]) -> int:
     counter[0] += 1
     return counter[0]
 
-def get_intervals(Nb: int, Max: int) -> List[List[int]]:
-    min_vals = list(range(Max + 1))   # Valeurs possibles pour la première et la dernière variable
-    max_vals = list(range(1, Max + 1)) # Valeurs possibles pour les autres variables
-    
-    problem = Problem()
-    # Générer des noms de variables dynamiquement
-    variable_names = [f"var_{i}" for i in range(Nb + 1)]
-    
-    # Ajouter la première variable (peut être entre 0 et Max)
-    problem.addVariable(variable_names[0], min_vals)
-    
-    # Ajouter les variables intermédiaires (entre 1 et Max)
-    for i in range(1, Nb):
-        problem.addVariable(variable_names[i], max_vals)
-    
-    # Ajouter la dernière variable (peut être entre 0 et Max)
-    problem.addVariable(variable_names[Nb], min_vals)
-    
-    # Ajouter la contrainte de somme exacte
-    problem.addConstraint(ExactSumConstraint(Max))
-    
-    # Récupérer les solutions
-    Res = problem.getSolutions()
-    Resultat = []
-    
-    # Reformater les résultats en liste de listes
-    for r in Res:
-        item = [r[var] for var in variable_names]
-        Resultat.append(item)
-    
-    return Resultat
+INTERVALS_CACHE_SIZE = 1024  # Nombre maximal de couples (Nb, Max) gardés en cache
+
+def iter_intervals(Nb: int, Max: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Génère paresseusement les répartitions de Max cases blanches en Nb + 1 intervalles.
+    Le premier et le dernier intervalle peuvent être vides, ceux entre deux blocs font au moins 1 case.
+    """
+    def place(i: int, remaining: int) -> Iterator[Tuple[int, ...]]:
+        if i == Nb:
+            yield (remaining,)
+            return
+        low = 0 if i == 0 else 1
+        high = remaining - (Nb - 1 - i)  # Réserver une case pour chaque intervalle intérieur restant
+        for size in range(low, high + 1):
+            for rest in place(i + 1, remaining - size):
+                yield (size,) + rest
+
+    return place(0, Max)
+
+@lru_cache(maxsize=INTERVALS_CACHE_SIZE)
+def get_intervals(Nb: int, Max: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Retourne toutes les répartitions de iter_intervals, mises en cache par (Nb, Max) avec éviction LRU.
+    Les compteurs de succès / échecs du cache sont donnés par get_intervals.cache_info().
+    """
+    return tuple(iter_intervals(Nb, Max))
+
+def encode_line_placement(cells: List[int], blocks: List[int], aux_counter: List[int]) -> Iterator[List[int]]:
+    """ Encode une ligne en énumérant tous les placements possibles des blocs (une variable auxiliaire par placement) """
+    length = len(cells)
+    total_blocks = sum(blocks)
+
+    if length - total_blocks < len(blocks) - 1:
+        yield []  # Indice trop long pour la ligne : clause vide, la grille n'a pas de solution
+        return
+
+    possible_intervals = get_intervals(len(blocks), length - total_blocks)
 
-def encode_row_constraints(rows: int, cols: int, row_hints: List[str], clauses: List[List[int]], aux_counter: List[int]) -> None:
+    conditions = []
+    for interval in possible_intervals:
+        cond = aux_var(aux_counter)
+        conditions.append(cond)
+        pos = 0
+        noire_counter = 0
+        for i in range(len(interval)-1):
+            for j in range(interval[i]):
+                yield [-cond, -cells[pos]]
+                pos += 1
+            for k in range(blocks[noire_counter]):
+                yield [-cond, cells[pos]]
+                pos += 1
+            noire_counter += 1
+        for _ in range(interval[-1]):
+            yield [-cond, -cells[pos]]
+            pos += 1
+    yield conditions
+
+def simplify_clause(clause: List) -> Iterator[List[int]]:
+    """ Produit la clause après simplification des littéraux constants (True / False), rien si elle est toujours satisfaite """
+    if not any(lit is True for lit in clause):
+        yield [lit for lit in clause if lit is not False]
+
+def encode_line_dp(cells: List[int], blocks: List[int], aux_counter: List[int]) -> Iterator[List[int]]:
+    """
+    Encode une ligne avec des variables "le bloc k commence au plus tard en p" (programmation dynamique sur les positions).
+    Le nombre de variables et de clauses est en O(longueur x nombre de blocs), au lieu du nombre de placements.
+    """
+    length = len(cells)
+    total_blocks = sum(blocks)
+
+    if length - total_blocks < len(blocks) - 1:
+        yield []  # Indice trop long pour la ligne : clause vide, la grille n'a pas de solution
+        return
+
+    blocks = [b for b in blocks if b > 0]
+    if not blocks:
+        for cell in cells:
+            yield [-cell]
+        return
+
+    # Positions de départ au plus tôt et au plus tard de chaque bloc
+    earliest = [sum(blocks[:k]) + k for k in range(len(blocks))]
+    latest = [length - sum(blocks[k:]) - (len(blocks) - 1 - k) for k in range(len(blocks))]
+    started = [[aux_var(aux_counter) for _ in range(earliest[k], latest[k])] for k in range(len(blocks))]
+
+    def before(k: int, p: int):
+        """ Littéral "le bloc k commence en une position <= p" (constante hors de l'intervalle de départ) """
+        if p < earliest[k]:
+            return False
+        if p >= latest[k]:
+            return True
+        return started[k][p - earliest[k]]
+
+    def neg(lit):
+        return (not lit) if isinstance(lit, bool) else -lit
+
+    for k, size in enumerate(blocks):
+        # Monotonie : commencer avant p implique commencer avant p + 1
+        for p in range(earliest[k] + 1, latest[k]):
+            yield from simplify_clause([neg(before(k, p - 1)), before(k, p)])
+        # Ordre : le bloc k + 1 commence au moins size + 1 cases après le bloc k
+        if k + 1 < len(blocks):
+            for p in range(earliest[k + 1], latest[k + 1]):
+                yield from simplify_clause([neg(before(k + 1, p)), before(k, p - size - 1)])
+
+    # Une case est noire si et seulement si elle est couverte par un bloc
+    covers = [[] for _ in range(length)]
+    for k, size in enumerate(blocks):
+        for c in range(earliest[k], latest[k] + size):
+            cov = aux_var(aux_counter)
+            covers[c].append(cov)
+            start_before, start_too_early = before(k, c), before(k, c - size)
+            yield from simplify_clause([-cov, start_before])
+            yield from simplify_clause([-cov, neg(start_too_early)])
+            yield from simplify_clause([neg(start_before), start_too_early, cov])
+            yield [-cov, cells[c]]
+    for c, cell in enumerate(cells):
+        yield [-cell] + covers[c]
+
+ENCODINGS = {
+    "placement": encode_line_placement,
+    "dp": encode_line_dp,
+}
+
+def encode_row_constraints(rows: int, cols: int, row_hints: List[str], aux_counter: List[int], encoding: str = "placement", fixed: Optional[Dict[int, bool]] = None, stats: Stats = NULL_STATS) -> Iterator[List[int]]:
+    encode_line = ENCODINGS[encoding]
     for row, hint in enumerate(row_hints):
         blocks = list(map(int, hint.split()))
-        total_blocks = sum(blocks)
-        
-        if cols - total_blocks < len(blocks) - 1:
-            continue  # Skip invalid constraints
-        
-        possible_intervals = get_intervals(len(blocks), cols - total_blocks)
-        
-        conditions = []
-        for interval in possible_intervals:
-            cond = aux_var(aux_counter)
-            conditions.append(cond)
-            pos = 0
-            noire_counter = 0
-            for i in range(len(interval)-1):
-                for j in range(interval[i]):
-                    clauses.append([-cond, -var(row, pos, cols)])
-                    pos += 1
-                for k in range(blocks[noire_counter]):
-                    clauses.append([-cond, var(row, pos, cols)])
-                    pos += 1
-                noire_counter += 1
-            for _ in range(interval[-1]):
-                clauses.append([-cond, -var(row, pos, cols)])
-                pos += 1
-        clauses.append(conditions)
+        cells = [var(row, j, cols) for j in range(cols)]
+        if fixed and all(cell in fixed for cell in cells):
+            continue  # Ligne entièrement fixée par la propagation
+        yield from stats.track(encode_line(cells, blocks, aux_counter), "row", str(row), lambda: aux_counter[0])
 
-def encode_col_constraints(rows: int, cols: int, col_hints: List[str], clauses: List[List[int]], aux_counter: List[int]) -> None:
+def encode_col_constraints(rows: int, cols: int, col_hints: List[str], aux_counter: List[int], encoding: str = "placement", fixed: Optional[Dict[int, bool]] = None, stats: Stats = NULL_STATS) -> Iterator[List[int]]:
+    encode_line = ENCODINGS[encoding]
     for idx, hint in enumerate(col_hints):
         blocks = list(map(int, hint.split()))
-        total_blocks = sum(blocks)
-        
-        if rows - total_blocks < len(blocks) - 1:
-            continue  # Skip invalid constraints
-        
-        possible_intervals = get_intervals(len(blocks), rows - total_blocks)
-        
-        conditions = []
-        for interval in possible_intervals:
-            cond = aux_var(aux_counter)
-            conditions.append(cond)
-            pos = 0
-            noire_counter = 0
-            for i in range(len(interval)-1):
-                for j in range(interval[i]):
-                    clauses.append([-cond, -var(pos, idx, cols)])
-                    pos += 1
-                for k in range(blocks[noire_counter]):
-                    clauses.append([-cond, var(pos, idx, cols)])
-                    pos += 1
-                noire_counter += 1
-            for _ in range(interval[-1]):
-                clauses.append([-cond, -var(pos, idx, cols)])
-                pos += 1
-        clauses.append(conditions)
+        cells = [var(i, idx, cols) for i in range(rows)]
+        if fixed and all(cell in fixed for cell in cells):
+            continue  # Colonne entièrement fixée par la propagation
+        yield from stats.track(encode_line(cells, blocks, aux_counter), "column", str(idx), lambda: aux_counter[0])
 
-def solve_picross2d(hints_filename: str, output_filename: str) -> None:
-    rows, cols, row_hints, col_hints = load_hints(hints_filename)
-    cnf_filename = "temp.cnf"
-    
-    clauses: List[List[int]] = []
+def propagate_lines(rows: int, cols: int, row_hints: List[str], col_hints: List[str]) -> Optional[Dict[int, bool]]:
+    """ Résout ligne par ligne jusqu'au point fixe et renvoie les cases fixées {variable: noire}, None si la grille est impossible """
+    return propagate(grid_lines(rows, cols, row_hints, col_hints))
+
+def grid_lines(rows: int, cols: int, row_hints: List[str], col_hints: List[str]):
+    """ Lignes puis colonnes de la grille pour propagation.propagate : (variables des cases, automate de l'indice) """
+    lines = []
+    for row, hint in enumerate(row_hints):
+        lines.append(([var(row, j, cols) for j in range(cols)], nonogram_automaton(list(map(int, hint.split())))))
+    for idx, hint in enumerate(col_hints):
+        lines.append(([var(i, idx, cols) for i in range(rows)], nonogram_automaton(list(map(int, hint.split())))))
+    return lines
+
+def decode_solution(solution: List[int], rows: int, cols: int) -> List[str]:
+    """ Convertit un modèle SAT en lignes de la grille ('X' pour une case noire, '.' sinon) """
+    from grids import cells_text, model_cells
+
+    return cells_text(model_cells(solution, (rows, cols)))
+
+def hint_blocks(hints: List[str]) -> List[List[int]]:
+    """ Longueurs des blocs de chaque indice ("0" : ligne vide) """
+    return [[block for block in map(int, hint.split()) if block] for hint in hints]
+
+def verify_grid(cells, row_hints: List[str], col_hints: List[str]):
+    """
+    Vérifie d'un coup une grille (tableau de booléens, voir grid_array) contre tous les indices :
+    renvoie (lignes respectées, colonnes respectées), deux tableaux de booléens.
+    """
+    from grids import check_runs
+
+    return check_runs(cells, hint_blocks(row_hints)), check_runs(cells.T, hint_blocks(col_hints))
+
+def propagate_grid(rows: int, cols: int, row_hints: List[str], col_hints: List[str], stats: Stats = NULL_STATS) -> Optional[Dict[int, bool]]:
+    """ propagate_lines chronométrée, avec le nombre de cases fixées enregistré dans stats """
+    with stats.phase("propagation"):
+        fixed = propagate_lines(rows, cols, row_hints, col_hints)
+    if fixed is not None:
+        stats.counters["fixed_cells"] = len(fixed)
+    return fixed
+
+def solve_grid(rows: int, cols: int, row_hints: List[str], col_hints: List[str], encoding: str = "placement", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS, lazy: bool = False, cache=None) -> Optional[List[str]]:
+    """
+    Résout une grille et renvoie ses lignes ('X' pour une case noire, '.' sinon), None si elle n'a pas de solution.
+    Les durées des phases et les tailles d'encodage sont enregistrées dans stats.
+    cache (voir cache.DiskCache) est consulté avant toute propagation ou tout encodage, et complété après la résolution.
+    """
+    if cache is not None:
+        key = cache_key(canonical_2d(rows, cols, row_hints, col_hints))
+        entry = cache.get(key)
+        stats.counters["cache_hit"] = int(entry is not None)
+        if entry is not None:
+            return entry["solution"]
+    if lazy:
+        grid = solve_grid_lazy(rows, cols, row_hints, col_hints, encoding, propagation, backend, stats)
+    else:
+        grids = enumerate_grids(rows, cols, row_hints, col_hints, 1, encoding, propagation, backend, stats)
+        grid = grids[0] if grids else None
+    if cache is not None:
+        cache.put(key, {"status": "unsat" if grid is None else "solved", "solution": grid})
+    return grid
+
+def solve_2d(row_hints: Sequence[Union[str, Sequence[int]]], col_hints: Sequence[Union[str, Sequence[int]]], encoding: str = "dp", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS) -> Optional[List[str]]:
+    """
+    Point d'entrée de la bibliothèque, sans fichier ni affichage (rien n'est écrit sur la sortie standard, les mesures
+    vont dans stats) : chaque indice est une chaîne ("1 2") ou une liste de longueurs de blocs ([1, 2]).
+    Renvoie les lignes de la grille comme solve_grid ; une grille sans ligne ni colonne a pour solution [].
+    """
+    row_hints = [format_hint(hint) for hint in row_hints]
+    col_hints = [format_hint(hint) for hint in col_hints]
+    return solve_grid(len(row_hints), len(col_hints), row_hints, col_hints, encoding, propagation, backend, stats)
+
+def enumerate_grids(rows: int, cols: int, row_hints: List[str], col_hints: List[str], limit: int = 2, encoding: str = "placement", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS) -> List[List[str]]:
+    """
+    Renvoie jusqu'à limit solutions distinctes de la grille. Le solveur garde son état entre deux solutions :
+    chaque solution est exclue par une clause de blocage sur les seules variables des cases, sans réencodage.
+    """
+    fixed: Dict[int, bool] = {}
+    if propagation:
+        fixed = propagate_grid(rows, cols, row_hints, col_hints, stats)
+        if fixed is None:
+            return []
+
+    if len(fixed) == rows * cols:
+        # Toutes les cases sont déduites des indices : la solution est forcément unique
+        solutions = [[v if fixed[v] else -v for v in range(1, rows * cols + 1)]]
+    else:
+        aux_counter = [rows * cols]  # Start auxiliary variables after grid variables
+
+        def clauses() -> Iterator[List[int]]:
+            """ Flux des clauses : les cases fixées par la propagation en clauses unitaires, puis les lignes et colonnes """
+            for v, black in fixed.items():
+                yield [v if black else -v]
+            yield from encode_row_constraints(rows, cols, row_hints, aux_counter, encoding, fixed, stats)
+            yield from encode_col_constraints(rows, cols, col_hints, aux_counter, encoding, fixed, stats)
+
+        solver = get_backend(backend)
+        solutions = stats.run_enumeration(solver, clauses(), rows * cols, range(1, rows * cols + 1), limit)
+        if encoding == "placement" and stats.enabled:
+            cache = get_intervals.cache_info()
+            stats.counters.update(intervals_cache_hits=cache.hits, intervals_cache_misses=cache.misses)
+
+    with stats.decoding():
+        return [decode_solution(solution, rows, cols) for solution in solutions]
+
+def solve_grid_lazy(rows: int, cols: int, row_hints: List[str], col_hints: List[str], encoding: str = "placement", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS) -> Optional[List[str]]:
+    """
+    Résolution paresseuse pour les très grandes grilles : seules les lignes non fixées par la propagation sont encodées
+    au départ. Chaque grille candidate est vérifiée colonne par colonne, seules les colonnes violées sont encodées,
+    puis le solveur repart de son état courant, jusqu'à ce que toutes les colonnes soient respectées.
+    """
+    fixed: Dict[int, bool] = {}
+    if propagation:
+        fixed = propagate_grid(rows, cols, row_hints, col_hints, stats)
+        if fixed is None:
+            return None
+    if len(fixed) == rows * cols:
+        with stats.decoding():
+            return decode_solution([v if fixed[v] else -v for v in range(1, rows * cols + 1)], rows, cols)
+
+    encode_line = ENCODINGS[encoding]
     aux_counter = [rows * cols]  # Start auxiliary variables after grid variables
-    
-    encode_row_constraints(rows, cols, row_hints, clauses, aux_counter)
-    encode_col_constraints(rows, cols, col_hints, clauses, aux_counter)
-    
-    with open(cnf_filename, "w") as f:
-        f.write(f"p cnf {aux_counter[0]} {len(clauses)}\n")
-        for clause in clauses:
-            f.write(" ".join(map(str, clause)) + " 0\n")
-    
-    # Run Gophersat solver
-    result = subprocess.run(["gophersat", cnf_filename], capture_output=True, text=True)
-    
-    if "UNSAT" in result.stdout:
+    from grids import cells_text, check_runs, model_cells
+
+    col_blocks = [list(map(int, hint.split())) for hint in col_hints]
+    expected = hint_blocks(col_hints)
+    # Colonnes pas encore transmises au solveur ; celles fixées par la propagation sont garanties par les clauses unitaires
+    pending = [j for j in range(cols) if not all(var(i, j, cols) in fixed for i in range(rows))]
+    added = 0
+    iterations = 0
+
+    solver = get_backend(backend)
+    with solver.session(rows * cols) as session:
+        with stats.phase("encode"):
+            session.add_clauses([v if black else -v] for v, black in fixed.items())
+            session.add_clauses(encode_row_constraints(rows, cols, row_hints, aux_counter, encoding, fixed, stats))
+        while True:
+            iterations += 1
+            with stats.phase("solve"):
+                solution = session.solve()
+            if solution is None:
+                grid = None
+                break
+            with stats.decoding():
+                cells = model_cells(solution, (rows, cols))
+            respected = check_runs(cells.T, expected)  # Toutes les colonnes vérifiées en une passe
+            violated = [j for j in pending if not respected[j]]
+            if not violated:
+                grid = cells_text(cells)
+                break
+            added += len(violated)
+            pending = sorted(set(pending) - set(violated))
+            with stats.phase("encode"):
+                for j in violated:
+                    cells = [var(i, j, cols) for i in range(rows)]
+                    session.add_clauses(stats.track(encode_line(cells, col_blocks[j], aux_counter), "column", str(j), lambda: aux_counter[0]))
+
+    stats.counters.update(lazy_iterations=iterations, lazy_columns_added=added)
+    if stats.enabled:
+        stats.solver = {"backend": solver.name, "variables": solver.num_vars, "clauses": solver.num_clauses, **solver.stats}
+    return grid
+
+def stream_grid(rows: int, cols: int, row_hints: List[str], col_hints: List[str], encoding: str = "dp", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS, budget: int = DEFAULT_BUDGET, backbone: bool = True):
+    """
+    Résolution progressive (voir progressive.stream_cells) : produit ((ligne, colonne), noire) pour chaque case dès
+    qu'elle est prouvée, par la propagation des lignes puis pendant la recherche SAT, et renvoie à la fin les lignes
+    de la grille comme solve_grid (None si pas de solution) : grid = yield from stream_grid(...).
+    """
+    aux_counter = [rows * cols]  # Start auxiliary variables after grid variables
+
+    def clauses(fixed: Dict[int, bool]) -> Iterator[List[int]]:
+        yield from encode_row_constraints(rows, cols, row_hints, aux_counter, encoding, fixed, stats)
+        yield from encode_col_constraints(rows, cols, col_hints, aux_counter, encoding, fixed, stats)
+
+    lines = grid_lines(rows, cols, row_hints, col_hints) if propagation else None
+    events = stream_cells(range(1, rows * cols + 1), clauses, lines, backend=backend, stats=stats, budget=budget, backbone=backbone)
+    try:
+        while True:
+            variable, black = next(events)
+            yield divmod(variable - 1, cols), black
+    except StopIteration as stop:
+        solution = stop.value
+    with stats.decoding():
+        return None if solution is None else decode_solution(solution, rows, cols)
+
+class ClueEditor:
+    """
+    Grille gardée ouverte pour l'édition interactive des indices. Les clauses de chaque ligne et de chaque colonne
+    sont gardées par un littéral d'activation, supposé vrai à chaque résolution. Modifier un indice retire l'ancien
+    groupe (son littéral est fixé à faux), ajoute le nouveau, puis relance le solveur sous hypothèses : les clauses
+    apprises et les encodages des autres lignes sont conservés. Pas de propagation : les cases qu'elle fixerait
+    dépendent de tous les indices.
+    """
+
+    def __init__(self, row_hints: Sequence[Union[str, Sequence[int]]], col_hints: Sequence[Union[str, Sequence[int]]], encoding: str = "dp", backend: BackendChoice = None, stats: Stats = NULL_STATS):
+        self.rows, self.cols = len(row_hints), len(col_hints)
+        self.hints = {"row": [format_hint(hint) for hint in row_hints], "column": [format_hint(hint) for hint in col_hints]}
+        self.encode_line = ENCODINGS[encoding]
+        self.stats = stats
+        self.aux_counter = [self.rows * self.cols]  # Variables auxiliaires et d'activation après celles des cases
+        self.activation: Dict[Tuple[str, int], int] = {}  # (type de ligne, indice) -> littéral d'activation de son groupe
+        self.retired = 0  # Groupes retirés par des modifications
+        self.solver = get_backend(backend)
+        self.session = self.solver.session(self.rows * self.cols)
+        with stats.phase("encode"):
+            for kind, hints in self.hints.items():
+                for index in range(len(hints)):
+                    self.add_line(kind, index)
+
+    def add_line(self, kind: str, index: int) -> None:
+        """ Encode l'indice courant d'une ligne ("row") ou d'une colonne ("column") sous un nouveau littéral d'activation """
+        literal = aux_var(self.aux_counter)
+        self.activation[(kind, index)] = literal
+        if kind == "row":
+            cells = [var(index, j, self.cols) for j in range(self.cols)]
+        else:
+            cells = [var(i, index, self.cols) for i in range(self.rows)]
+        blocks = list(map(int, self.hints[kind][index].split()))
+        clauses = self.stats.track(self.encode_line(cells, blocks, self.aux_counter), kind, str(index), lambda: self.aux_counter[0])
+        self.session.add_clauses(clause + [-literal] for clause in clauses)
+
+    def set_hint(self, kind: str, index: int, hint: Union[str, Sequence[int]]) -> None:
+        """ Remplace l'indice d'une ligne ("row") ou d'une colonne ("column") ; IndexError / ValueError si la ligne ou l'indice est invalide """
+        if kind not in self.hints:
+            raise ValueError(f"Type de ligne invalide : {kind} (row ou column)")
+        if not 0 <= index < len(self.hints[kind]):
+            raise IndexError(f"Indice de {kind} hors de la grille : {index}")
+        hint = format_hint(hint)
+        if any(block < 0 for block in map(int, hint.split())):
+            raise ValueError(f"Indice invalide : {hint}")
+        if hint == self.hints[kind][index]:
+            return
+        with self.stats.phase("encode"):
+            self.session.add_clauses([[-self.activation[(kind, index)]]])  # L'ancien groupe ne contraint plus rien
+            self.retired += 1
+            self.hints[kind][index] = hint
+            self.add_line(kind, index)
+
+    def solve(self) -> Optional[List[str]]:
+        """ Résout la grille avec les indices courants : ses lignes, ou None si elle n'a pas de solution """
+        with self.stats.phase("solve"):
+            model = self.session.solve(list(self.activation.values()))
+        if self.stats.enabled:
+            self.stats.solver = {"backend": self.solver.name, "variables": self.solver.num_vars, "clauses": self.solver.num_clauses,
+                                 "retired_groups": self.retired, **self.solver.stats}
+        if model is None:
+            return None
+        with self.stats.decoding():
+            return decode_solution(model, self.rows, self.cols)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ClueEditor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def edit_picross2d(hints_filename: str, encoding: str = "dp", backend: BackendChoice = None, stats: Stats = NULL_STATS) -> None:
+    """
+    Édition interactive : résout la grille, puis lit sur l'entrée standard des modifications « row I INDICE »
+    ou « col J INDICE » (ex. « row 3 1 2 », « col 0 0 ») et affiche après chacune la grille et le temps de réponse.
+    """
+    _, _, row_hints, col_hints = load_hints(hints_filename)
+    with ClueEditor(row_hints, col_hints, encoding, backend, stats) as editor:
+        start = time.perf_counter()
+        grid = editor.solve()
+        for line in [None] + [line for line in sys.stdin]:
+            if line is not None:
+                words = line.split()
+                if not words:
+                    continue
+                if len(words) < 2 or words[0] not in ("row", "col") or not words[1].isdigit():
+                    print("Format attendu : row I INDICE ou col J INDICE")
+                    continue
+                start = time.perf_counter()
+                try:
+                    editor.set_hint("row" if words[0] == "row" else "column", int(words[1]), " ".join(words[2:]) or "0")
+                except (IndexError, ValueError) as error:
+                    print(f"Modification ignorée : {error}")
+                    continue
+                grid = editor.solve()
+            print("\n".join(grid) if grid is not None else "No solution found.")
+            print(f"Réponse en {1000 * (time.perf_counter() - start):.1f} ms")
+            sys.stdout.flush()
+
+def write_if_changed(filename: str, text: str) -> None:
+    """ Écrit text dans filename, sauf si le fichier contient déjà exactement ce texte """
+    try:
+        with open(filename, "r") as f:
+            if f.read() == text:
+                return
+    except FileNotFoundError:
+        pass
+    with open(filename, "w") as f:
+        f.write(text)
+
+def print_solve_summary(stats: Stats, rows: int, cols: int) -> None:
+    """ Messages de la ligne de commande sur le déroulement de la résolution, lus dans les mesures de stats """
+    counters = stats.counters
+    if counters.get("cache_hit"):
+        print("Solution trouvée dans le cache")
+        return
+    if "fixed_cells" in counters:
+        print(f"Propagation : {counters['fixed_cells']}/{rows * cols} cases fixées en {stats.phases['propagation']:.3f} s")
+        if counters["fixed_cells"] == rows * cols:
+            print("Grille entièrement résolue par propagation, solveur SAT évité")
+            return
+    solver = stats.solver
+    if "lazy_iterations" in counters:
+        print(f"Mode paresseux : {counters['lazy_iterations']} résolutions, {counters['lazy_columns_added']}/{cols} colonnes encodées, "
+              f"{solver['clauses']} clauses, {solver['variables']} variables")
+    elif "fixed_cells" in counters and solver:
+        print(f"CNF résiduelle : {solver['clauses']} clauses, {solver['variables']} variables")
+
+def solve_picross2d(hints_filename: str, output_filename: str, encoding: str = "placement", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS, lazy: bool = False, cache=None, binary: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Résout une grille et écrit sa solution dans output_filename, et à côté au format binary ("npy" ou "bits") s'il est donné.
+    Renvoie les lignes de la grille, None si elle n'a pas de solution.
+    """
+    stats = stats if stats.enabled else Stats()  # Le déroulement affiché est lu dans les mesures
+    with stats.phase("parse"):
+        rows, cols, row_hints, col_hints = load_hints(hints_filename)
+    solution_grid = solve_grid(rows, cols, row_hints, col_hints, encoding, propagation, backend, stats, lazy, cache)
+    print_solve_summary(stats, rows, cols)
+    write_solution(output_filename, solution_grid, binary)
+    return solution_grid
+
+def write_solution(output_filename: str, solution_grid: Optional[List[str]], binary: Optional[str] = None) -> None:
+    """ Écrit (et affiche) la solution dans output_filename, et à côté au format binary ("npy" ou "bits") s'il est donné """
+    if solution_grid is None:
         print("No solution found.")
-        with open(output_filename, "w") as f:
-            f.write("No solution found.\n")
+        write_if_changed(output_filename, "No solution found.\n")
+        return
+
+    # Write the solution grid to the output file
+    write_if_changed(output_filename, "".join(row + "\n" for row in solution_grid))
+    if binary:
+        from grids import save_cells
+
+        save_cells(grid_array(solution_grid), os.path.splitext(output_filename)[0] + "." + binary)
+
+    # Optionally print the grid
+    for row in solution_grid:
+        print(row)
+
+def stream_picross2d(hints_filename: str, output_filename: str, encoding: str = "dp", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS, display: bool = True, binary: Optional[str] = None) -> Tuple[bool, Optional[List[str]]]:
+    """
+    Résolution progressive d'un fichier (voir stream_grid) : avec display, les cases prouvées sont dessinées en direct
+    dans une fenêtre Tk. La solution est écrite comme avec solve_picross2d, avec le délai avant la première case.
+    Renvoie (terminé, lignes de la grille ou None) : terminé est faux si la fenêtre est fermée avant la fin du flux
+    (rien n'est alors écrit).
+    """
+    stats = stats if stats.enabled else Stats()  # Le délai avant la première case est relevé dans stats
+    with stats.phase("parse"):
+        rows, cols, row_hints, col_hints = load_hints(hints_filename)
+    start = time.perf_counter()
+    events = stream_grid(rows, cols, row_hints, col_hints, encoding, propagation, backend, stats)
+
+    finished = []
+
+    def finish(grid):
+        finished.append(grid)
+        elapsed = time.perf_counter() - start
+        write_solution(output_filename, grid, binary)
+        counters = stats.counters
+        print(f"Première case en {1000 * stats.phases.get('first_cell', elapsed):.1f} ms, grille complète en {1000 * elapsed:.1f} ms "
+              f"({counters['propagated_cells']} par propagation, {counters['probed_cells']} sondées pendant la recherche, "
+              f"{counters['backbone_cells']} du squelette, {counters['completed_cells']} complétées)")
+
+    if not display:
+        finish(follow(events, lambda cell, black: None))
+        return True, finished[0]
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.title("Nonogram")
+    draw_stream(root, rows, cols, row_hints, col_hints, events, finish)
+    root.mainloop()
+    if not finished:
+        print("Résolution interrompue : fenêtre fermée avant la fin du flux.")
+        return False, None
+    return True, finished[0]
+
+def check_picross2d(hints_filename: str, limit: int = 2, encoding: str = "placement", propagation: bool = True, backend: BackendChoice = None, stats: Stats = NULL_STATS) -> int:
+    """
+    Vérifie l'unicité de la solution (limit = 2) ou compte les solutions jusqu'à limit.
+    Affiche le verdict et, si la solution n'est pas unique, une deuxième solution comme témoin ; renvoie le nombre trouvé.
+    """
+    stats = stats if stats.enabled else Stats()  # Le déroulement affiché est lu dans les mesures
+    with stats.phase("parse"):
+        rows, cols, row_hints, col_hints = load_hints(hints_filename)
+    grids = enumerate_grids(rows, cols, row_hints, col_hints, limit, encoding, propagation, backend, stats)
+    print_solve_summary(stats, rows, cols)
+
+    if not grids:
+        print("unsat: no solution")
+    elif len(grids) == 1 and limit == 1:
+        print("sat: at least 1 solution")  # Limite atteinte dès la première solution : l'unicité n'est pas vérifiée
+    elif len(grids) == 1:
+        print("unique: exactly one solution")
     else:
-        # Get the solution
-        solution = result.stdout.split("\n")[2].split()
-        solution.pop(0)  # Remove trailing empty string
-        
-        # Initialize an empty grid
-        solution_grid = [["." for _ in range(cols)] for _ in range(rows)]
-        
-        # Process the solution
-        for var in solution[:rows * cols]:
-            var = int(var)
-            if var > 0:
-                # Find the corresponding grid cell for this variable
-                i, j = divmod(var - 1, cols)  # Convert variable to (row, col)
-                solution_grid[i][j] = 'X'
-            elif var < 0:
-                var = -var
-                i, j = divmod(var - 1, cols)  # Convert variable to (row, col)
-                solution_grid[i][j] = '.'
-
-        # Write the solution grid to the output file
-        with open(output_filename, "w") as f:
-            for row in solution_grid:
-                f.write("".join(row) + "\n")
-        
-        # Optionally print the grid
-        for row in solution_grid:
-            print("".join(row))
+        more = "at least " if len(grids) == limit else ""
+        print(f"multiple: {more}{len(grids)} solutions")
+        for index in (0, 1):
+            print(f"Solution {index + 1}:")
+            for row in grids[index]:
+                print(row)
+    return len(grids)
 
 def main():
     parser = argparse.ArgumentParser(description="Solve a Picross 2D puzzle and visualize the result.")
     parser.add_argument("--input_filename", type=str, required=True, help="Name of the input file (e.g., cactus.txt)")
+    parser.add_argument("--encoding", type=str, choices=sorted(ENCODINGS), default="placement", help="Line encoding: 'placement' enumerates every placement, 'dp' is linear in length x blocks")
+    parser.add_argument("--backend", type=str, choices=sorted(BACKENDS), default=None, help="SAT solver backend (default: pysat if installed, gophersat otherwise)")
+    parser.add_argument("--no-propagation", action="store_true", help="Send every cell to the SAT solver without line-solving first")
+    parser.add_argument("--stats", type=str, choices=["text", "json"], default=None, help="Print per-phase timings, encoding sizes and solver statistics")
+    parser.add_argument("--profile", type=str, default=None, help="Dump a cProfile profile of the solve to this file")
+    parser.add_argument("--lazy", action="store_true", help="Encode rows first and add only the columns violated by each candidate grid, re-solving incrementally (for very large grids)")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="PATH", help="Look up and store solutions in a persistent cache (default path: $PICROSS_CACHE or ~/.cache/picross/solutions.sqlite)")
+    parser.add_argument("--no-display", action="store_true", help="Solve and write the solution file without opening the Tk window")
+    parser.add_argument("--binary", type=str, choices=["npy", "bits"], default=None, help="Also write the solution next to the text file as a NumPy .npy array or a bit-packed .bits file")
+    parser.add_argument("--animate", action="store_true", help="Fill the grid progressively in time-sliced chunks instead of drawing it at once")
+    parser.add_argument("--export", type=str, default=None, metavar="IMAGE", help="Also write the solved grid to a PNG or PPM image (no Tk needed)")
+    parser.add_argument("--cell-size", type=int, default=8, help="Cell size in pixels of the exported image")
+    parser.add_argument("--check-unique", action="store_true", help="Report whether the puzzle has a unique solution (unique / multiple with a second witness / unsat) instead of displaying it")
+    parser.add_argument("--interactive", action="store_true", help="Keep the solver open and read clue edits ('row I HINT' or 'col J HINT') from stdin, re-solving incrementally after each one")
+    parser.add_argument("--count-solutions", type=int, default=None, metavar="N", help="Count distinct solutions up to N instead of displaying the grid")
+    parser.add_argument("--progressive", action="store_true", help="Stream cells as soon as they are proven (line propagation, then during the SAT search) and draw them live; reports the time to the first cell")
 
     args = parser.parse_args()
+    if args.count_solutions is not None and args.count_solutions < 1:
+        parser.error("--count-solutions must be at least 1")
     input_filename = args.input_filename
+    encoding = args.encoding
+    propagation = not args.no_propagation
+    backend = args.backend
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     hints_filename = os.path.join(script_dir, "..",INPUTS_2D,input_filename)
     output_filename = os.path.join(script_dir, "..","data","outputs-2D", input_filename.replace(".txt", "_solution.txt"))
 
-    solve_picross2d(hints_filename, output_filename)
+    stats = Stats() if args.stats else NULL_STATS
+    cache = None if args.cache is None else DiskCache(args.cache or None)
+    if args.interactive:
+        edit_picross2d(hints_filename, encoding, backend, stats)
+        if args.stats:
+            print(stats.report(args.stats))
+        return
+    if args.progressive:
+        with profiled(args.profile):
+            finished, grid = stream_picross2d(hints_filename, output_filename, encoding, propagation, backend, stats, not args.no_display, args.binary)
+        if args.stats:
+            print(stats.report(args.stats))
+        if finished and args.export:
+            export_solution(grid, args.export, args.cell_size)
+        return
+    if args.check_unique or args.count_solutions:
+        with profiled(args.profile):
+            check_picross2d(hints_filename, args.count_solutions or 2, encoding, propagation, backend, stats)
+        if args.stats:
+            print(stats.report(args.stats))
+        return
+
+    with profiled(args.profile):
+        grid = solve_picross2d(hints_filename, output_filename, encoding, propagation, backend, stats, args.lazy, cache, args.binary)
+    if args.stats:
+        print(stats.report(args.stats))
+    if args.export:
+        export_solution(grid, args.export, args.cell_size)
+    if args.no_display:
+        return
     # Création de la fenêtre Tkinter
+    import tkinter as tk
+
     root = tk.Tk()
     root.title("Nonogram")
-    draw_nonogram(root, output_filename, hints_filename)
+    draw_nonogram(root, output_filename, hints_filename, args.animate)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,37 +1,95 @@
+import contextlib
+import copy
 import itertools
-import subprocess
+import multiprocessing
 import os
 import sys
-import pyvista as pv
-import numpy as np
 import argparse
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from cache import DiskCache, cache_key, canonical_3d
+from progressive import DEFAULT_BUDGET, background, drain, follow, stream_cells
+from propagation import probe, stack_automaton, propagate
+from solvers import BACKENDS, get_backend
+from stats import NULL_STATS, Stats, profiled
 
 INPUTS_3D = os.path.join("data", "inputs-3D")
+OUTPUTS_3D = os.path.join("data", "outputs-3D")
+CLUE_SHAPES = {"(": ("circle", ")"), "[": ("square", "]")}  # Ouverture -> (type d'indice, fermeture)
+
+
+def parse_clue(clue):
+    """
+    Lit un indice de pile : ("plain", n) pour un nombre simple, ("circle", n) pour (n), ("square", n) pour [n],
+    None pour '-' (pile sans indice). Les nombres peuvent avoir plusieurs chiffres ; ValueError si l'indice est mal formé.
+    """
+    if clue == '-':
+        return None
+    kind, closing = CLUE_SHAPES.get(clue[0], ("plain", ""))
+    number = clue[1:-1] if closing else clue
+    if (closing and not clue.endswith(closing)) or not number.isdigit():
+        raise ValueError(f"Indice de pile invalide : {clue}")
+    return kind, int(number)
 
 
 
 class Picross3D:
-    def __init__(self, filename):
-        """ Constructeur : Charge un puzzle depuis un fichier """
-        self.width, self.height, self.depth, self.sides = self.load_picross3d(filename)
+    # Encodages disponibles pour les piles à nombre simple : nom -> méthode génératrice de clauses
+    PLAIN_ENCODINGS = {
+        "combinations": "PlainStackCondition",
+        "ladder": "LadderStackCondition",
+    }
+
+    def __init__(self, filename, propagation=True, plain_encoding="combinations", stats=NULL_STATS, text=None, cache=None, slices=False):
+        """
+        Constructeur : Charge un puzzle depuis un fichier, ou depuis son contenu text s'il est donné.
+        cache (voir cache.DiskCache) est consulté avant la propagation et l'encodage, et complété par solve().
+        slices ajoute à la propagation des piles le sondage de chaque tranche comme un puzzle 2D (voir propagate_slices).
+        """
+        self.stats = stats  # Mesures de la résolution (voir stats.Stats)
+        with stats.phase("parse"):
+            if text is None:
+                self.width, self.height, self.depth, self.sides = self.load_picross3d(filename)
+            else:
+                self.width, self.height, self.depth, self.sides = self.parse_picross3d(text)
         self.variables = {}
-        self.clauses = []
         self.solution = None
         self.numLiterals = 1  # Pour commencer à générer les variables
+        self.plain_encoding = plain_encoding  # Encodage des piles à nombre simple (voir PLAIN_ENCODINGS)
         self.indices = self.init_indices()  # Initialisation des indices
-        self.generate_constraints()  # Génération des contraintes
+        self.cache = cache
+        self.slices = slices
+        self.cached = None  # Résultat trouvé dans le cache
+        if cache is not None:
+            self.cached = cache.get(self.cache_key())
+            stats.counters["cache_hit"] = int(self.cached is not None)
+        self.fixed = self.propagate() if propagation and self.cached is None else {}  # Blocs fixés par propagation sur les piles
+
+    @classmethod
+    def from_text(cls, text, propagation=True, plain_encoding="combinations", stats=NULL_STATS, cache=None, slices=False):
+        """ Crée un puzzle à partir du contenu d'un fichier de data/inputs-3D, sans lire de fichier """
+        return cls(None, propagation, plain_encoding, stats, text=text, cache=cache, slices=slices)
+
+    def cache_key(self):
+        """ Clé du puzzle dans le cache des solutions """
+        return cache_key(canonical_3d(self.width, self.height, self.depth, self.sides))
 
     def load_picross3d(self, filename):
         """ Charge un puzzle Picross 3D depuis un fichier """
         path = os.path.join(INPUTS_3D, filename)
         with open(path, "r") as file:
-            lines = [line.strip() for line in file.readlines()]
+            return self.parse_picross3d(file.read())
+
+    @staticmethod
+    def parse_picross3d(text):
+        """ Lit les dimensions et les indices des trois faces d'un puzzle au format de data/inputs-3D """
+        lines = [line.strip() for line in text.splitlines()]
 
         width, height, depth = map(int, lines[0].split())
         sides = {0: [], 1: [], 2: []}
 
         index = 1
-        expected_lines = {0: height, 1: depth, 2: width}
+        expected_lines = {0: height, 1: width, 2: height}  # Lignes de chaque face : y, x et y
 
         while index < len(lines) and not lines[index]:
             index += 1
@@ -47,6 +105,12 @@ class Picross3D:
 
         return width, height, depth, sides
 
+    def new_variable(self):
+        """ Crée une nouvelle variable SAT auxiliaire """
+        variable = self.numLiterals
+        self.numLiterals += 1
+        return variable
+
     def init_indices(self):
         """ Initialise les indices des variables SAT pour chaque bloc du puzzle """
         indices = {}
@@ -59,25 +123,137 @@ class Picross3D:
         return indices
 
 
-    def generate_constraints(self):
-        """ Génère les contraintes SAT pour chaque face du puzzle """
+    def stack_automaton(self, col):
+        """ Automate de propagation correspondant à un indice (nombre simple, cerclé ou carré) """
+        clueType, sideNum = parse_clue(col)
+        if clueType == "circle":
+            return stack_automaton(sideNum, 2, 2)  # Exactement 2 groupes
+        if clueType == "square":
+            return stack_automaton(sideNum, 3)  # Au moins 3 groupes
+        return stack_automaton(sideNum, min(sideNum, 1), min(sideNum, 1))  # Un seul groupe continu
+
+    def propagate(self):
+        """ Résout les piles une à une jusqu'au point fixe et renvoie les blocs fixés {variable: présent}, None si le puzzle est impossible """
+        start = time.perf_counter()
+        lines, slices = self.stack_lines()
+        fixed = propagate(lines)
+        elapsed = time.perf_counter() - start
+        self.stats.add_time("propagation", elapsed)
+        if fixed is None:
+            print("Propagation : le puzzle n'a pas de solution")
+            return None
+        self.stats.counters["fixed_cells"] = len(fixed)
+        print(f"Propagation : {len(fixed)}/{len(self.indices)} blocs fixés en {elapsed:.3f} s")
+        if self.slices and len(fixed) < len(self.indices):
+            fixed = self.propagate_slices(lines, slices, fixed)
+        return fixed
+
+    def stack_lines(self):
+        """
+        Piles portant un indice pour propagation.propagate, (blocs, automate), et tranches
+        {(axe, coordonnée): piles contenues dans la tranche} pour propagate_slices
+        """
+        lines = []
+        slices = {}
+        for sideIndex, rowIndex, colIndex, col in self.clue_stacks():
+            stack = self.get_stack_of_blocks(sideIndex, rowIndex, colIndex)
+            lines.append((stack, self.stack_automaton(col)))
+            for key in self.stack_slices(sideIndex, rowIndex, colIndex):
+                slices.setdefault(key, []).append(lines[-1])
+        return lines, slices
+
+    def stack_slices(self, sideIndex, rowIndex, colIndex):
+        """ Tranches (axe, coordonnée) qui contiennent la pile : les deux coordonnées fixes de la pile """
+        if sideIndex == 0:
+            return [("y", rowIndex), ("z", colIndex)]
+        if sideIndex == 1:
+            return [("x", self.width - rowIndex - 1), ("z", colIndex)]
+        return [("y", rowIndex), ("x", self.width - colIndex - 1)]
+
+    def propagate_slices(self, lines, slices, fixed):
+        """
+        Pré-résolution par tranches : chaque tranche orthogonale à un axe est un puzzle 2D dont les lignes sont
+        les piles des deux autres faces. Ses blocs inconnus sont sondés (propagation.probe), puis les blocs fixés
+        sont propagés sur toutes les piles des trois axes, jusqu'à ce qu'aucune tranche n'apporte plus rien.
+        """
+        start = time.perf_counter()
+        before = len(fixed)
+        blocks_of = {key: {block for stack, _ in slice_lines for block in stack} for key, slice_lines in slices.items()}
+        pending = list(slices)  # Tranches à sonder : au départ toutes, ensuite celles qui contiennent un bloc nouvellement fixé
+        while pending and fixed is not None:
+            key = pending.pop(0)
+            known = {block: fixed[block] for block in blocks_of[key] if block in fixed}
+            if len(known) == len(blocks_of[key]):
+                continue
+            result = probe(slices[key], known, sorted(blocks_of[key] - known.keys()))
+            if result is None or len(result) == len(known):
+                fixed = None if result is None else fixed
+                continue
+            new = [block for block in result if block not in fixed]
+            updated = propagate(lines, {**fixed, **result}, new)
+            if updated is not None:
+                newly_fixed = updated.keys() - fixed.keys()
+                pending += [other for other in slices if other not in pending and not blocks_of[other].isdisjoint(newly_fixed)]
+            fixed = updated
+        elapsed = time.perf_counter() - start
+        self.stats.add_time("slice_propagation", elapsed)
+        if fixed is None:
+            print("Propagation par tranches : le puzzle n'a pas de solution")
+            return None
+        self.stats.counters["slice_fixed_cells"] = len(fixed) - before
+        print(f"Propagation par tranches : {len(fixed) - before} blocs de plus, {len(fixed)}/{len(self.indices)} blocs fixés en {elapsed:.3f} s")
+        return fixed
+
+    def unknown_span(self, stack):
+        """ Pile sans ses blocs d'extrémité fixés absents : ils ne changent ni le nombre de blocs ni les groupes """
+        start, end = 0, len(stack)
+        while start < end and self.fixed.get(stack[start]) is False:
+            start += 1
+        while end > start and self.fixed.get(stack[end - 1]) is False:
+            end -= 1
+        return stack[start:end]
+
+    def clue_stacks(self):
+        """ Piles portant un indice : (face, ligne, colonne, indice) """
         for sideIndex in range(len(self.sides)):
             side = self.sides[sideIndex]
             for rowIndex in range(len(side)):
                 row = side[rowIndex]
                 for colIndex in range(len(row)):
-                    col = row[colIndex]
-                    if col != '-':
-                        stack = self.get_stack_of_blocks(sideIndex, rowIndex, colIndex)
-                        if col[0] == '(':
-                            sideNum = int(col[1])
-                            self.clauses.extend(self.CircleStackCondition(stack, sideNum))
-                        elif col[0] == '[':
-                            sideNum = int(col[1])
-                            self.clauses.extend(self.SquareStackCondition(stack, sideNum))
-                        else:
-                            sideNum = int(col)
-                            self.clauses.extend(self.PlainStackCondition(stack, sideNum))
+                    if row[colIndex] != '-':
+                        yield sideIndex, rowIndex, colIndex, row[colIndex]
+
+    def generate_constraints(self, stacks=None):
+        """
+        Génère au fil de l'eau les contraintes SAT pour chaque face du puzzle (générateur de clauses).
+        stacks restreint l'encodage à ces piles (face, ligne, colonne) et aux blocs fixés qu'elles contiennent.
+        """
+        if self.fixed is None:
+            return  # Puzzle impossible, rien à encoder
+        selected = None if stacks is None else set(stacks)
+        # Les blocs fixés par la propagation deviennent des clauses unitaires
+        if selected is None:
+            fixed_blocks = self.fixed
+        else:
+            fixed_blocks = {block for stack in selected for block in self.get_stack_of_blocks(*stack) if block in self.fixed}
+        for block in fixed_blocks:
+            yield [block if self.fixed[block] else -block]
+        for sideIndex, rowIndex, colIndex, col in self.clue_stacks():
+            if selected is not None and (sideIndex, rowIndex, colIndex) not in selected:
+                continue
+            stack = self.get_stack_of_blocks(sideIndex, rowIndex, colIndex)
+            if all(block in self.fixed for block in stack):
+                continue  # Pile entièrement fixée par la propagation
+            stack = self.unknown_span(stack)
+            clueType, sideNum = parse_clue(col)
+            if clueType == "circle":
+                clauses = self.CircleStackCondition(stack, sideNum)
+            elif clueType == "square":
+                clauses = self.SquareStackCondition(stack, sideNum)
+            else:
+                clauses = getattr(self, self.PLAIN_ENCODINGS[self.plain_encoding])(stack, sideNum)
+            label = f"face {sideIndex} ({rowIndex}, {colIndex})"
+            yield from self.stats.track(clauses, clueType, label, lambda: self.numLiterals - 1)
 
     def get_stack_of_blocks(self, sideIndex, rowIndex, colIndex):
         """ Retourne la liste des blocs dans une pile donnée par les indices du puzzle """
@@ -100,217 +276,553 @@ class Picross3D:
         return stack
 
     def PlainStackCondition(self, stack, sideNum):
-        """ Construit les clauses CNF pour une pile de blocs (plain number) """
-        sentences = []
-        if sideNum == 0:
+        """ Génère les clauses CNF pour une pile de blocs (plain number) """
+        if sideNum > len(stack):
+            yield []  # Indice impossible : clause vide
+        elif sideNum == 0:
             # Pas de bloc dans cette pile
             for block in stack:
-                sentences.append([-block])  # Le bloc n'est pas dans la solution
+                yield [-block]  # Le bloc n'est pas dans la solution
         elif sideNum == len(stack):
             # Tous les blocs dans cette pile doivent être dans la solution
             for block in stack:
-                sentences.append([block])  # Le bloc est dans la solution
+                yield [block]  # Le bloc est dans la solution
         else:
             # Constructeur pour exactement "sideNum" blocs dans cette pile
-            combos = list(itertools.combinations(stack, len(stack) - sideNum + 1))
-            for combo in combos:
-                sentences.append(list(combo))
+            for combo in itertools.combinations(stack, len(stack) - sideNum + 1):
+                yield list(combo)
 
-            combos = list(itertools.combinations(stack, sideNum + 1))
-            for c in combos:
-                combo = list(c)
-                for i in range(len(combo)):
-                    combo[i] *= -1
-                sentences.append(combo)
+            for combo in itertools.combinations(stack, sideNum + 1):
+                yield [-block for block in combo]
 
             # Les blocs doivent apparaître dans une ligne continue
             for start in range(len(stack)):
                 for nextBlock in range(start + sideNum, len(stack)):
-                    sentences.append([stack[start] * -1, stack[nextBlock] * -1])
+                    yield [stack[start] * -1, stack[nextBlock] * -1]
+
 
-        return sentences
 
 
+    def LadderStackCondition(self, stack, sideNum):
+        """
+        Génère les clauses CNF pour une pile de blocs (plain number) avec des variables "le groupe commence au plus tard en p".
+        Le nombre de clauses et de variables est linéaire en la taille de la pile, au lieu des combinaisons de PlainStackCondition.
+        """
+        if sideNum == 0 or sideNum >= len(stack):
+            yield from self.PlainStackCondition(stack, sideNum)
+            return
+
+        last_start = len(stack) - sideNum
+        started = [self.new_variable() for _ in range(last_start)]
+
+        def before(p):
+            """ Littéral "le groupe commence en une position <= p" : None si toujours faux (p < 0), True si toujours vrai """
+            if p < 0:
+                return None
+            if p >= last_start:
+                return True
+            return started[p]
+
+        # Monotonie : commencer avant p implique commencer avant p + 1
+        for p in range(1, last_start):
+            yield [-started[p - 1], started[p]]
+
+        # Un bloc est présent si et seulement si le groupe a commencé sans être déjà terminé
+        for i, block in enumerate(stack):
+            start_before, start_too_early = before(i), before(i - sideNum)
+            if start_before is not True:
+                yield [-block, start_before]
+            if start_too_early is not None:
+                yield [-block, -start_too_early]
+            yield [block] + ([] if start_before is True else [-start_before]) + ([] if start_too_early is None else [start_too_early])
+
+    def GroupStartVariables(self, stack):
+        """ Crée une variable "un groupe commence ici" par bloc de la pile et renvoie (variables, clauses d'équivalence) """
+        starts = [self.new_variable() for _ in stack]
+        clauses = []
+        for i, (block, start) in enumerate(zip(stack, starts)):
+            clauses.append([-start, block])
+            if i == 0:
+                clauses.append([-block, start])
+            else:
+                clauses.append([-start, -stack[i - 1]])
+                clauses.append([-block, stack[i - 1], start])
+        return starts, clauses
+
+    def CounterVariables(self, literals, bound):
+        """
+        Compteur séquentiel : renvoie (registres, clauses) où registres[j] est vrai si et seulement si
+        au moins j + 1 des littéraux sont vrais, pour j < bound. Taille en O(len(literals) x bound).
+        """
+        clauses = []
+        previous = []  # Registres sur les littéraux déjà parcourus (au plus i registres après i littéraux)
+        for i, literal in enumerate(literals):
+            current = [self.new_variable() for _ in range(min(i + 1, bound))]
+            for j, register in enumerate(current):
+                below = previous[j - 1] if j > 0 else None  # None : "au moins 0" toujours vrai
+                same = previous[j] if j < len(previous) else None  # None : "au moins j + 1" encore impossible
+                # register <-> same ou (literal et below)
+                if same is not None:
+                    clauses.append([-same, register])
+                clauses.append([-literal, register] + ([-below] if below is not None else []))
+                clauses.append([-register, literal] + ([same] if same is not None else []))
+                if below is not None:
+                    clauses.append([-register, below] + ([same] if same is not None else []))
+            previous = current
+        return previous, clauses
+
+    def GroupedStackCondition(self, stack, sideNum, minGroups, maxGroups=None):
+        """
+        Génère les clauses CNF pour une pile de sideNum blocs répartis en un nombre de groupes compris entre
+        minGroups et maxGroups (None pour "au moins minGroups"), à l'aide de variables de début de groupe et de compteurs.
+        """
+        if sideNum < minGroups or sideNum + minGroups - 1 > len(stack):
+            yield []  # Indice impossible : clause vide
+            return
 
+        # Exactement sideNum blocs présents
+        blocks, clauses = self.CounterVariables(stack, sideNum + 1)
+        yield from clauses
+        yield [blocks[sideNum - 1]]
+        if sideNum < len(blocks):
+            yield [-blocks[sideNum]]
+
+        # Nombre de groupes = nombre de débuts de groupe
+        starts, clauses = self.GroupStartVariables(stack)
+        yield from clauses
+        bound = minGroups if maxGroups is None else maxGroups + 1
+        groups, clauses = self.CounterVariables(starts, bound)
+        yield from clauses
+        yield [groups[minGroups - 1]]
+        if maxGroups is not None and maxGroups < len(groups):
+            yield [-groups[maxGroups]]
 
     def CircleStackCondition(self, stack, sideNum):
-        """Construit les clauses CNF pour une pile avec un nombre exact de 2 groupes de blocs séparés par au moins un bloc vide.
+        """
+        Génère les clauses CNF pour une pile de sideNum blocs formant exactement 2 groupes séparés par au moins un bloc vide.
         Example: stack de 4 blocs, sideNum = 2
         Les sols possibles sont:
         - 1 0 1 0
         - 0 1 0 1
         - 1 0 0 1
-        (il faut au moins un bloc vide entre les 2 groupes continus de blocs)
-
-
         """
-        sentences = []
-        if sideNum == 0:
-            # Pas de bloc dans cette pile
-            for block in stack:
-                sentences.append([-block])
-        elif sideNum == len(stack):
-            # Tous les blocs dans cette pile doivent être dans la solution
-            for block in stack:
-                sentences.append([block])
-        else:
-            # Construire les groupes de blocs
-            for start in range(len(stack) - sideNum + 1):
-                for end in range(start + sideNum, len(stack) + 1):
-                    group = stack[start:end]
-                    if len(group) == sideNum:
-                        sentences.append(group)
-            # Les groupes doivent être séparés par au moins un bloc vide
-            for start in range(len(stack) - sideNum):
-                for end in range(start + sideNum + 1, len(stack)):
-                    group1 = stack[start:start + sideNum]
-                    group2 = stack[end:end + sideNum]
-                    sentences.append([group1[0] * -1, group2[0] * -1])
-        print(sentences)
-        return sentences
-
+        yield from self.GroupedStackCondition(stack, sideNum, 2, 2)
 
     def SquareStackCondition(self, stack, sideNum):
         """
-        Construit les clauses CNF pour une pile avec un nombre de 3+ groupes de blocs séparés par au moins un bloc vide.
-        La difficulté ici est que l'on ne connait pas le nombre de groupes à l'avance. Pour cela on limite le nombre de groupes à la longueur de la ligne - 2 (puisque au moins 2 blocs vides sont nécessaires pour séparer les groupes).
+        Génère les clauses CNF pour une pile de sideNum blocs formant au moins 3 groupes séparés par au moins un bloc vide.
         Exemple: stack de 6 blocs, sideNum = 3
         Les solutions possibles sont:
         - 1 0 1 0 1 0
         - 0 1 0 1 0 1
         - 1 0 0 1 0 1
         - 1 0 1 0 0 1
-        - 0 1 0 1 0 1
         """
-        
-        sentences = []
-        
-        if sideNum == 0:
-            # Pas de bloc dans cette pile
-            for block in stack:
-                sentences.append([-block])
-        else:
-            # On génère toutes les combinaisons possibles de sideNum blocs parmi les n blocs de la pile
-            combos = list(itertools.combinations(stack, sideNum))
-            for combo in combos:
-                if self.has_at_least_three_groups(combo):
-                    # Convertir la combinaison en une liste de clauses CNF
-                    sentences.append(list(combo))
-        print(sentences)
-        return sentences
-
-
-    def has_at_least_three_groups(self, combo):
-        """
-        Vérifie si une combinaison de blocs a au moins 3 groupes séparés par au moins un bloc vide.
-        """
-        group_counter = 0
-        prev_block = -1
-        
-        # On parcourt la combinaison pour compter les groupes
-        for index in range(len(combo)):
-            if combo[index] > prev_block + 1:
-                group_counter += 1  # Détecter un nouveau groupe
-            prev_block = combo[index]
-        
-        return group_counter >= 3
+        yield from self.GroupedStackCondition(stack, sideNum, 3)
 
-    
-    
-    
+    def solve(self, backend=None, components=False, workers=None):
+        """
+        Résout le puzzle avec le backend SAT demandé et renvoie le modèle (liste de littéraux), None si pas de solution.
+        Les durées de l'encodage et de la résolution sont enregistrées dans self.stats.
+        Avec components, chaque composante indépendante est résolue à part sur workers processus (voir solve_components).
+        """
+        if self.cached is not None:
+            print("Solution trouvée dans le cache")
+            bits = self.cached["solution"]
+            if bits is None:
+                return None
+            # Même ordre x, y, z que decode_solution
+            blocks = [self.variables[(x, y, z)] for x in range(self.width) for y in range(self.height) for z in range(self.depth)]
+            self.solution = [var if bit == "1" else -var for var, bit in sorted(zip(blocks, bits))]
+            return self.solution
+
+        if self.fixed is None:
+            self.solution = None
+        elif len(self.fixed) == len(self.indices):
+            print("Puzzle entièrement résolu par propagation, solveur SAT évité")
+            self.solution = [var if self.fixed[var] else -var for var in sorted(self.fixed)]
+        elif components:
+            self.solution = self.solve_components(backend, workers)
+        else:
+            solver = get_backend(backend)
+            self.solution = self.stats.run_solver(solver, self.generate_constraints(), self.numLiterals - 1)
+            if self.solution is not None:
+                print(f"{solver.name} a résolu le puzzle avec succès")
 
-    
-    def solve(self):
-        """ Résout le puzzle avec Gophersat """
-        cnf = f"p cnf {self.numLiterals - 1} {len(self.clauses)}\n" + "\n".join(" ".join(map(str, clause)) + " 0" for clause in self.clauses)
+        self.store_solution()
+        return self.solution
 
-        with open("temp.cnf", "w") as file:
-            file.write(cnf + "\n")
+    def store_solution(self):
+        """ Enregistre le résultat de la résolution (self.solution, None si UNSAT) dans le cache, s'il y en a un """
+        if self.cache is not None:
+            bits = None if self.solution is None else self.decode_solution(self.solution)
+            self.cache.put(self.cache_key(), {"status": "unsat" if bits is None else "solved", "solution": bits})
 
-        result = subprocess.run(["gophersat", "temp.cnf"], capture_output=True, text=True)
+    def components(self):
+        """
+        Composantes indépendantes du graphe des contraintes restantes : deux blocs inconnus sont liés quand ils
+        partagent une pile non résolue. Renvoie, de la plus grande à la plus petite, des couples
+        (piles (face, ligne, colonne) de la composante, blocs inconnus de la composante).
+        """
+        parent = {}
+
+        def find(block):
+            root = block
+            while parent.setdefault(root, root) != root:
+                root = parent[root]
+            while parent[block] != root:
+                parent[block], block = root, parent[block]
+            return root
+
+        stacks = []
+        for sideIndex, rowIndex, colIndex, _ in self.clue_stacks():
+            unknown = [block for block in self.get_stack_of_blocks(sideIndex, rowIndex, colIndex) if block not in self.fixed]
+            if unknown:
+                stacks.append(((sideIndex, rowIndex, colIndex), unknown))
+                root = find(unknown[0])
+                for block in unknown[1:]:
+                    parent[find(block)] = root
+
+        groups = {}
+        for stack, unknown in stacks:
+            component = groups.setdefault(find(unknown[0]), ([], set()))
+            component[0].append(stack)
+            component[1].update(unknown)
+        return sorted(groups.values(), key=lambda component: len(component[1]), reverse=True)
+
+    def solve_component(self, stacks, blocks, backend=None):
+        """
+        Résout une composante seule : renvoie ({bloc: présent}, variables, clauses, temps CPU), ou None si elle est impossible.
+        Les variables comptées sont les blocs inconnus de la composante et ses variables auxiliaires ; le temps CPU
+        compte aussi les solveurs externes, et ne dépend pas du nombre de processus qui se partagent les cœurs.
+        """
+        start = sum(os.times()[:4])
+        self.numLiterals = len(self.indices) + 1  # Les variables auxiliaires de chaque composante repartent après les blocs
+        solver = get_backend(backend)
+        model = solver.solve(self.generate_constraints(stacks), len(self.indices))
+        if model is None:
+            return None
+        variables = len(blocks) + solver.num_vars - len(self.indices)
+        return {block: model[block - 1] > 0 for block in blocks}, variables, solver.num_clauses, sum(os.times()[:4]) - start
 
-        if result.returncode == 0:
-            print("Gophersat a résolu le puzzle avec succès")
-            return result.stdout
+    def solve_components(self, backend=None, workers=None):
+        """
+        Résout séparément les composantes indépendantes (voir components), en parallèle sur workers processus
+        (par défaut un par cœur), et fusionne leurs blocs avec ceux fixés par la propagation. Les blocs qui
+        n'appartiennent à aucune pile indicée sont libres et laissés vides. S'arrête dès qu'une composante est impossible.
+        """
+        start = time.perf_counter()
+        parts = self.components()
+        sizes = [len(blocks) for _, blocks in parts]
+        self.stats.counters.update(components=len(parts), largest_component=max(sizes, default=0))
+        print(f"Décomposition : {len(parts)} composantes indépendantes, tailles {sizes[:10]}{' ...' if len(sizes) > 10 else ''}")
+
+        workers = min(workers or os.cpu_count(), len(parts))
+        values = dict(self.fixed)
+        results = []
+        if workers <= 1:
+            for stacks, blocks in parts:
+                results.append(self.solve_component(stacks, blocks, backend))
+                if results[-1] is None:
+                    break
         else:
-            print("Erreur avec Gophersat", result.stderr)
+            worker_puzzle = copy.copy(self)
+            worker_puzzle.stats, worker_puzzle.cache = NULL_STATS, None  # Seul le puzzle est transmis aux processus
+            with multiprocessing.Pool(workers, initializer=init_component_worker, initargs=(worker_puzzle,)) as pool:
+                for result in pool.imap_unordered(solve_component_task, [(stacks, blocks, backend) for stacks, blocks in parts]):
+                    results.append(result)
+                    if result is None:
+                        break  # Sortir du bloc with arrête les autres processus
+        elapsed = time.perf_counter() - start
+        self.stats.add_time("solve", elapsed)
+        if results and results[-1] is None:
+            print("Une composante n'a pas de solution : le puzzle est impossible")
             return None
 
+        for component, _, _, _ in results:
+            values.update(component)
+        sequential = sum(seconds for _, _, _, seconds in results)
+        self.stats.counters["component_cpu_ms"] = round(sequential * 1000)
+        if self.stats.enabled:
+            self.stats.solver = {"backend": get_backend(backend).name, "variables": sum(r[1] for r in results), "clauses": sum(r[2] for r in results)}
+        print(f"Composantes résolues en {elapsed:.3f} s sur {max(workers, 1)} processus "
+              f"(temps CPU des résolutions {sequential:.3f} s, accélération x{sequential / elapsed if elapsed else 1:.2f})")
+        return [var if values.get(var, False) else -var for var in range(1, len(self.indices) + 1)]
+
+    def enumerate_solutions(self, limit=2, backend=None):
+        """
+        Renvoie jusqu'à limit modèles distincts sur les blocs du puzzle (liste vide si pas de solution).
+        Le solveur garde son état : chaque modèle est exclu par une clause de blocage sur les variables de self.indices.
+        """
+        if self.fixed is None:
+            return []
+        if len(self.fixed) == len(self.indices):
+            # Tous les blocs sont déduits des indices : la solution est forcément unique
+            return [[var if self.fixed[var] else -var for var in sorted(self.fixed)]]
+
+        solver = get_backend(backend)
+        return self.stats.run_enumeration(solver, self.generate_constraints(), self.numLiterals - 1,
+                                          sorted(self.indices.values()), limit)
+
+    def stream_solution(self, backend=None, propagation=True, budget=DEFAULT_BUDGET, backbone=True):
+        """
+        Résolution progressive (voir progressive.stream_cells) : produit ((x, y, z), gardé) pour chaque bloc dès qu'il
+        est prouvé (blocs déjà fixés, propagation des piles, puis recherche SAT) et renvoie le modèle comme solve().
+        Un résultat en cache est produit d'un bloc ; un flux mené à son terme complète le cache.
+        Pour mesurer le délai avant le premier bloc, créer le puzzle sans propagation et la laisser à ce flux.
+        """
+        positions = {var: position for position, var in self.indices.items()}
+        if self.cached is not None or self.fixed is None:
+            model = self.solve(backend)
+            for literal in model or []:
+                yield positions[abs(literal)], literal > 0
+            return model
+
+        def clauses(fixed):
+            self.fixed = fixed  # generate_constraints n'encode que les piles qui restent à résoudre
+            return self.generate_constraints()
+
+        lines = self.stack_lines()[0] if propagation else None
+        events = stream_cells(sorted(positions), clauses, lines, self.fixed, backend, self.stats, budget, backbone)
+        try:
+            while True:
+                var, kept = next(events)
+                yield positions[var], kept
+        except StopIteration as stop:
+            self.solution = stop.value
+        self.store_solution()
+        return self.solution
+
+    def decode_solution(self, solution):
+        """ Convertit un modèle SAT en chaîne de '0' / '1', un caractère par bloc dans l'ordre x, y, z """
+        from grids import cells_bits
+
+        return cells_bits(self.solution_volume(solution))
+
     def print_solution(self, solution):
         """ Affiche la solution du puzzle """
-        # Split solution into lines and filter out the non-solution part
-        solution_lines = solution.splitlines()
-        
-        # Find the line with 'v ' and process the literals
-        solution_values = []
-        for line in solution_lines:
-            if line.startswith('v '):
-                solution_values = line.split()[1:]  # Skip 'v' and take the literals
-        
-        # Ensure solution_values is not empty
-        if not solution_values:
+        if not solution:
             print("No solution found.")
             return
 
-        # Convert solution literals to integers
-        satisfied_vars = set(map(int, solution_values))
-        
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    var_index = self.variables[(x, y, z)]  # Get the literal for this (x, y, z)
-                    if var_index > 0:
-                        print('1' if var_index in satisfied_vars else '0', end=' ')  # Positive literal means "1"
-                    else:
-                        print('0' if var_index in satisfied_vars else '1', end=' ')  # Negative literal means "0"
-                print()
-            print()
+        from grids import cells_text
+
+        # Une ligne par (x, y), les blocs de la pile en z séparés par des espaces, une ligne vide entre deux x
+        for layer in self.solution_volume(solution):
+            print("".join(" ".join(line) + " \n" for line in cells_text(layer, "1", "0")))
 
 
 
-    def visualize_solution(self, solution):
-        """ Affiche la solution du puzzle en 3D avec un mini-repère en haut à droite """
+    def solution_volume(self, solution):
+        """
+        Solution sous forme de volume NumPy de booléens indexé par [x, y, z]. Les variables des blocs sont
+        1..largeur x hauteur x profondeur dans l'ordre x, y, z (voir init_indices) : le décodage est vectorisé.
+        """
+        from grids import model_cells  # Import paresseux : NumPy n'est chargé qu'au décodage
+
+        return model_cells(solution, (self.width, self.height, self.depth))
 
-        # Extraire les valeurs de la solution SAT
-        solution_lines = solution.splitlines()
-        solution_values = []
+    def side_stacks(self, volume, sideIndex):
+        """ Piles d'une face sous forme de tableau [ligne, colonne, bloc], dans l'ordre de get_stack_of_blocks """
+        if sideIndex == 0:
+            return volume.transpose(1, 2, 0)  # [y, z, x]
+        if sideIndex == 1:
+            return volume[::-1].transpose(0, 2, 1)  # [largeur - 1 - x, z, y]
+        return volume[::-1].transpose(1, 0, 2)  # [y, largeur - 1 - x, z]
 
-        for line in solution_lines:
-            if line.startswith('v '):
-                solution_values = line.split()[1:]  # On saute le 'v' et on garde les littéraux
+    def violated_stacks(self, volume):
+        """
+        Vérifie d'un coup un volume de booléens contre les indices des trois faces et renvoie le nombre de piles violées :
+        nombre de blocs, et groupes (un seul pour un nombre simple, deux pour un nombre cerclé, au moins trois pour un carré).
+        """
+        import numpy as np
+        from grids import line_counts
 
-        if not solution_values:
+        violated = 0
+        for sideIndex in range(3):
+            side = self.sides[sideIndex]
+            if not side:
+                continue
+            clues = [[parse_clue(clue) or ("hidden", -1) for clue in row] for row in side]
+            counts = np.array([[count for _, count in row] for row in clues])
+            kinds = np.array([[kind for kind, _ in row] for row in clues])
+            filled, groups = line_counts(self.side_stacks(volume, sideIndex))
+            groups_ok = np.where(kinds == "circle", groups == 2, np.where(kinds == "square", groups >= 3, groups == np.minimum(counts, 1)))
+            violated += int(((counts >= 0) & ((filled != counts) | ~groups_ok)).sum())
+        return violated
+
+    def visualize_solution(self, solution, export=None, show_empty=True):
+        """
+        Affiche la solution du puzzle en 3D avec un mini-repère en haut à droite.
+        Avec export, rien n'est affiché : la vue est enregistrée en image (.png) ou le maillage en fichier (voir render_volume).
+        """
+        if not solution:
             print("Aucune solution trouvée pour la visualisation.")
             return
+        render_volume(self.solution_volume(solution), export, show_empty)
 
-        satisfied_vars = set(map(int, solution_values))  # Convertir en ensemble pour recherche rapide
 
-        # Création du plot interactif
-        plotter = pv.Plotter()
+MESH_FORMATS = (".vtu", ".vtk", ".stl", ".ply", ".vtp")  # Formats d'export du maillage, sans rendu
 
-        # Ajout des cubes (blocs actifs en vert, inactifs en gris semi-transparent)
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    var_index = self.variables[(x, y, z)]  # Récupérer l'index SAT
-                    
-                    if var_index in satisfied_vars:
-                        color = "green"  # Bloc actif
-                        opacity = 1.0  # Opaque
-                    else:
-                        color = "gray"  # Bloc supprimé
-                        opacity = 0.1  # Semi-transparent
-                    
-                    cube = pv.Cube(center=(x, y, z), x_length=1, y_length=1, z_length=1)
-                    plotter.add_mesh(cube, color=color, opacity=opacity, show_edges=True)
-
-        # Ajout du mini-repère 3D en haut à droite
-        plotter.add_axes(interactive=True)  # Affiche un petit repère qui tourne avec la figure
 
-        # Affichage interactif (rotation, zoom, etc.)
-        plotter.show()
+def volume_meshes(volume):
+    """
+    Maillages fusionnés des blocs gardés et des blocs supprimés d'un volume de booléens : une grille régulière
+    dont on seuille les cellules, plutôt qu'un cube par bloc. Le bloc (x, y, z) est centré en (x, y, z).
+    """
+    import numpy as np
+    import pyvista as pv  # Import paresseux : VTK n'est chargé que pour l'affichage
+
+    grid = pv.ImageData(dimensions=tuple(size + 1 for size in volume.shape), origin=(-0.5, -0.5, -0.5))
+    grid.cell_data["kept"] = volume.ravel(order="F").astype(np.uint8)  # VTK parcourt x en premier
+    kept = grid.threshold(0.5, scalars="kept")
+    empty = grid.threshold(0.5, scalars="kept", invert=True)
+    return kept, empty
 
 
+def render_volume(volume, export=None, show_empty=True):
+    """
+    Rendu d'un volume de booléens en deux acteurs au plus (blocs gardés en vert, supprimés en gris translucide).
+    export = None ouvre la fenêtre interactive ; un fichier .png est rendu hors écran ; un fichier de MESH_FORMATS
+    reçoit le maillage des blocs gardés (surface extérieure pour .stl, .ply et .vtp).
+    """
+    import pyvista as pv
+
+    kept, empty = volume_meshes(volume)
+    extension = os.path.splitext(export)[1].lower() if export else ""
+    if extension in MESH_FORMATS:
+        mesh = kept if extension in (".vtu", ".vtk") else kept.extract_surface()
+        mesh.save(export)
+        return
+
+    plotter = pv.Plotter(off_screen=export is not None)
+    if kept.n_cells:
+        plotter.add_mesh(kept, color="green", show_edges=True)
+    if show_empty and empty.n_cells:
+        plotter.add_mesh(empty, color="gray", opacity=0.1, show_edges=True)
+
+    # Ajout du mini-repère 3D en haut à droite
+    plotter.add_axes(interactive=export is None)  # Affiche un petit repère qui tourne avec la figure
+
+    if export is None:
+        # Affichage interactif (rotation, zoom, etc.)
+        plotter.show()
+    else:
+        plotter.screenshot(export)
+        plotter.close()
+
+
+STREAM_REFRESH_MS = 50  # Intervalle (en millisecondes) entre deux relevés des blocs prouvés
+STREAM_CHUNK = 0.015  # Durée maximale (en secondes) d'un relevé, pour garder la fenêtre réactive
+
+
+def show_states(plotter, grid, show_empty=True):
+    """
+    Remplace les acteurs des blocs gardés (état 1, en vert) et supprimés (état 2, en gris translucide) d'après
+    grid.cell_data["state"] ; les blocs encore inconnus (état 0) ne sont pas dessinés.
+    """
+    meshes = {"kept": (1, {"color": "green", "show_edges": True})}
+    if show_empty:
+        meshes["empty"] = (2, {"color": "gray", "opacity": 0.1, "show_edges": True})
+    for name, (state, style) in meshes.items():
+        mesh = grid.threshold([state - 0.5, state + 0.5], scalars="state")
+        if mesh.n_cells:
+            plotter.add_mesh(mesh, name=name, reset_camera=False, **style)
+        else:
+            plotter.remove_actor(name)
+
+
+def render_stream(shape, events, show_empty=True):
+    """
+    Vue 3D en direct d'un flux de résolution progressive (voir Picross3D.stream_solution) : le flux est consommé
+    dans un thread et une minuterie VTK relève les blocs prouvés toutes les STREAM_REFRESH_MS, sur le contour du
+    puzzle. Renvoie (terminé, résultat du flux) : terminé est faux si la fenêtre est fermée avant la fin du flux.
+    """
+    import numpy as np
+    import pyvista as pv
+
+    state = np.zeros(shape, dtype=np.uint8)
+    grid = pv.ImageData(dimensions=tuple(size + 1 for size in shape), origin=(-0.5, -0.5, -0.5))
+    grid.cell_data["state"] = state.ravel(order="F")
+    updates = background(events)
+    result = {}
+
+    plotter = pv.Plotter()
+    plotter.add_mesh(grid.outline(), color="black")
+    plotter.add_axes(interactive=True)
+
+    def refresh(step):
+        received = drain(updates, STREAM_CHUNK)
+        for cell, value in received:
+            if cell is None:
+                result["value"] = value
+            else:
+                state[cell] = 1 if value else 2
+        if received:
+            grid.cell_data["state"] = state.ravel(order="F")
+            show_states(plotter, grid, show_empty)
+            plotter.render()
+
+    plotter.add_timer_event(max_steps=sys.maxsize, duration=STREAM_REFRESH_MS, callback=refresh)
+    plotter.show()
+    return "value" in result, result.get("value")
+
+
+def save_binary_solution(puzzle, solution, puzzle_file, fmt):
+    """ Enregistre la solution dans data/outputs-3D au format fmt ("npy" ou "bits", voir grids.save_cells) """
+    from grids import save_cells
+
+    os.makedirs(OUTPUTS_3D, exist_ok=True)
+    name = os.path.splitext(os.path.basename(puzzle_file))[0]
+    save_cells(puzzle.solution_volume(solution), os.path.join(OUTPUTS_3D, f"{name}_solution.{fmt}"))
+
+
+_COMPONENT_PUZZLE = None  # Puzzle de chaque processus de Picross3D.solve_components
+
+
+def init_component_worker(puzzle):
+    """ Initialise un processus de résolution des composantes : le puzzle n'est transmis qu'une fois par processus """
+    global _COMPONENT_PUZZLE
+    sys.stdout = open(os.devnull, "w")
+    _COMPONENT_PUZZLE = puzzle
+
+
+def solve_component_task(task):
+    """ Tâche d'un processus : (piles, blocs, backend) d'une composante, voir Picross3D.solve_component """
+    return _COMPONENT_PUZZLE.solve_component(*task)
+
+
+def compare_plain_encodings(filenames):
+    """ Affiche, pour chaque puzzle, le nombre de clauses et de variables produit par chaque encodage des piles simples """
+    print(f"{'puzzle':<28}" + "".join(f"{name + ' (clauses/vars)':>32}" for name in Picross3D.PLAIN_ENCODINGS))
+    for filename in filenames:
+        counts = []
+        for name in Picross3D.PLAIN_ENCODINGS:
+            puzzle = Picross3D(filename, propagation=False, plain_encoding=name)
+            num_clauses = sum(1 for _ in puzzle.generate_constraints())
+            counts.append(f"{num_clauses} / {puzzle.numLiterals - 1}")
+        print(f"{filename:<28}" + "".join(f"{count:>32}" for count in counts))
+
+
+def compare_propagation(filenames, backend=None):
+    """
+    Affiche, pour chaque puzzle, les blocs laissés au solveur SAT, la taille de l'encodage et la durée totale
+    sans propagation, avec la propagation des piles et avec en plus celle des tranches.
+    """
+    modes = {"sans": (False, False), "piles": (True, False), "tranches": (True, True)}
+    print(f"{'puzzle':<28}" + "".join(f"{name + ' (inconnus/clauses/vars/s)':>40}" for name in modes))
+    for filename in filenames:
+        cells = []
+        for propagation, slices in modes.values():
+            stats = Stats()
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                puzzle = Picross3D(filename, propagation=propagation, plain_encoding="ladder", stats=stats, slices=slices)
+                puzzle.solve(backend)
+            elapsed = time.perf_counter() - start
+            unknown = len(puzzle.indices) - len(puzzle.fixed or {})
+            cells.append(f"{unknown} / {stats.solver.get('clauses', 0)} / {stats.solver.get('variables', 0)} / {elapsed:.3f}")
+        print(f"{filename:<28}" + "".join(f"{cell:>40}" for cell in cells))
 
 
 if __name__ == "__main__":
@@ -318,20 +830,108 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Résoudre un puzzle Picross 3D")
     
     # Ajouter un argument pour le nom du fichier du puzzle
-    parser.add_argument("puzzle_file", type=str, help="Nom du fichier du puzzle à résoudre")
+    parser.add_argument("puzzle_file", type=str, nargs="?", help="Nom du fichier du puzzle à résoudre")
+    parser.add_argument("--plain-encoding", type=str, choices=sorted(Picross3D.PLAIN_ENCODINGS), default="combinations", help="Encodage des piles à nombre simple : 'combinations' (combinaisons) ou 'ladder' (linéaire)")
+    parser.add_argument("--compare-encodings", action="store_true", help="Comparer la taille des encodages des piles simples sur le puzzle (ou tout data/inputs-3D) sans résoudre")
+    parser.add_argument("--backend", type=str, choices=sorted(BACKENDS), default=None, help="Solveur SAT (par défaut pysat s'il est installé, gophersat sinon)")
+    parser.add_argument("--no-propagation", action="store_true", help="Envoyer tous les blocs au solveur SAT sans propagation préalable")
+    parser.add_argument("--components", action="store_true", help="Résoudre séparément, en parallèle, les composantes indépendantes laissées par la propagation")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus pour --components (par défaut : nombre de cœurs)")
+    parser.add_argument("--slices", action="store_true", help="Après la propagation des piles, sonder chaque tranche comme un puzzle 2D (plus lent, fixe davantage de blocs)")
+    parser.add_argument("--compare-propagation", action="store_true", help="Comparer blocs inconnus, clauses, variables et durée sans propagation, avec les piles et avec les tranches, sur le puzzle (ou tout data/inputs-3D)")
+    parser.add_argument("--stats", type=str, choices=["text", "json"], default=None, help="Afficher les durées par phase, la taille de l'encodage et les statistiques du solveur")
+    parser.add_argument("--profile", type=str, default=None, help="Enregistrer un profil cProfile de la résolution dans ce fichier")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="CHEMIN", help="Consulter et compléter un cache persistant des solutions (par défaut : $PICROSS_CACHE ou ~/.cache/picross/solutions.sqlite)")
+    parser.add_argument("--binary", type=str, choices=["npy", "bits"], default=None, help="Enregistrer aussi la solution dans data/outputs-3D en tableau NumPy .npy ou en bits compactés .bits")
+    parser.add_argument("--export", type=str, default=None, metavar="FICHIER", help="Enregistrer la vue (.png) ou le maillage (.vtu, .vtk, .stl, .ply, .vtp) sans ouvrir de fenêtre")
+    parser.add_argument("--hide-empty", action="store_true", help="Ne pas dessiner les blocs supprimés")
+    parser.add_argument("--no-display", action="store_true", help="Afficher la solution dans le terminal sans la visualisation 3D")
+    parser.add_argument("--check-unique", action="store_true", help="Vérifier que la solution est unique (unique / multiple avec une deuxième solution / unsat) sans visualisation")
+    parser.add_argument("--count-solutions", type=int, default=None, metavar="N", help="Compter les solutions distinctes jusqu'à N sans visualisation")
+    parser.add_argument("--progressive", action="store_true", help="Afficher les blocs en direct dès qu'ils sont prouvés (propagation des piles, puis pendant la recherche SAT) et mesurer le délai avant le premier bloc")
     
     # Analyser les arguments passés en ligne de commande
     args = parser.parse_args()
+
+    if args.compare_encodings:
+        compare_plain_encodings([args.puzzle_file] if args.puzzle_file else sorted(os.listdir(INPUTS_3D)))
+        sys.exit(0)
+    if args.compare_propagation:
+        compare_propagation([args.puzzle_file] if args.puzzle_file else sorted(os.listdir(INPUTS_3D)), args.backend)
+        sys.exit(0)
+    if args.puzzle_file is None:
+        parser.error("le fichier du puzzle est requis")
+    if args.count_solutions is not None and args.count_solutions < 1:
+        parser.error("--count-solutions doit valoir au moins 1")
     
-    # Créer une instance de Picross3D en utilisant le fichier spécifié en argument
-    puzzle = Picross3D(args.puzzle_file)
-    
-    # Résoudre le puzzle
-    solution = puzzle.solve()
+    stats = Stats() if args.stats else NULL_STATS
+    if args.check_unique or args.count_solutions:
+        limit = args.count_solutions or 2
+        with profiled(args.profile):
+            puzzle = Picross3D(args.puzzle_file, propagation=not args.no_propagation, plain_encoding=args.plain_encoding, stats=stats, slices=args.slices)
+            solutions = puzzle.enumerate_solutions(limit, args.backend)
+        if args.stats:
+            print(stats.report(args.stats))
+        if not solutions:
+            print("unsat : aucune solution")
+        elif len(solutions) == 1 and limit == 1:
+            print("sat : au moins 1 solution")  # Limite atteinte dès la première solution : l'unicité n'est pas vérifiée
+        elif len(solutions) == 1:
+            print("unique : une seule solution")
+        else:
+            print(f"multiple : {'au moins ' if len(solutions) == limit else ''}{len(solutions)} solutions")
+            for index in (0, 1):
+                print(f"Solution {index + 1} :")
+                puzzle.print_solution(solutions[index])
+        sys.exit(0)
+
+    if args.progressive:
+        incompatible = [flag for flag, used in (("--slices", args.slices), ("--components", args.components), ("--export", args.export)) if used]
+        if incompatible:
+            parser.error(f"--progressive ne prend pas en charge {', '.join(incompatible)}")
+        stats = stats if stats.enabled else Stats()  # Le délai avant le premier bloc est relevé dans stats
+        cache = None if args.cache is None else DiskCache(args.cache or None)
+        with profiled(args.profile):
+            # La propagation est laissée au flux : ses blocs sont affichés au fur et à mesure
+            puzzle = Picross3D(args.puzzle_file, propagation=False, plain_encoding=args.plain_encoding, stats=stats, cache=cache)
+            events = puzzle.stream_solution(args.backend, not args.no_propagation)
+            if args.no_display:
+                finished, solution = True, follow(events, lambda block, kept: None)
+            else:
+                finished, solution = render_stream((puzzle.width, puzzle.height, puzzle.depth), events, not args.hide_empty)
+        if not finished:
+            if "first_cell" in stats.phases:
+                print(f"Premier bloc en {1000 * stats.phases['first_cell']:.1f} ms")
+            print("Résolution interrompue : fenêtre fermée avant la fin du flux.")
+            sys.exit(0)
+        counters = stats.counters
+        if "first_cell" in stats.phases:
+            print(f"Premier bloc en {1000 * stats.phases['first_cell']:.1f} ms ({counters['propagated_cells']} par propagation, "
+                  f"{counters['probed_cells']} sondés pendant la recherche, {counters['backbone_cells']} du squelette, "
+                  f"{counters['completed_cells']} complétés)")
+        if args.stats:
+            print(stats.report(args.stats))
+        puzzle.print_solution(solution)
+        if solution and args.binary:
+            save_binary_solution(puzzle, solution, args.puzzle_file, args.binary)
+        sys.exit(0)
+
+    cache = None if args.cache is None else DiskCache(args.cache or None)
+    with profiled(args.profile):
+        # Créer une instance de Picross3D en utilisant le fichier spécifié en argument
+        puzzle = Picross3D(args.puzzle_file, propagation=not args.no_propagation, plain_encoding=args.plain_encoding, stats=stats, cache=cache, slices=args.slices)
+
+        # Résoudre le puzzle
+        solution = puzzle.solve(args.backend, args.components, args.workers)
+    if args.stats:
+        print(stats.report(args.stats))
     
     # Si une solution est trouvée, l'afficher et la visualiser
     if solution:
         puzzle.print_solution(solution)
-        puzzle.visualize_solution(solution)
+        if args.binary:
+            save_binary_solution(puzzle, solution, args.puzzle_file, args.binary)
+        if args.export or not args.no_display:
+            puzzle.visualize_solution(solution, args.export, not args.hide_empty)
     else:
         print("Aucune solution trouvée pour ce puzzle.")
\ No newline at end of file
@@ -0,0 +1,177 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+from picross2d.picross2d import ENCODINGS, format_hint, load_hints, solve_grid
+from picross3d.picross3d import Picross3D
+from solvers import BACKENDS, default_backend_name, get_backend
+from stats import Stats
+
+# Configurations lancées par défaut : encodage[:backend[:graine]][@durée maximale en secondes]
+DEFAULT_PORTFOLIO = {
+    "2d": ["dp", "placement", "dp::1"],
+    "3d": ["ladder", "combinations", "ladder::1"],
+}
+
+
+def parse_configuration(text):
+    """ Lit une configuration "encodage[:backend[:graine]][@durée]" (ex. "dp:pysat:3@20") """
+    text, _, timeout = text.partition("@")
+    encoding, backend, seed = (text.split(":") + ["", ""])[:3]
+    return {
+        "encoding": encoding,
+        "backend": backend or default_backend_name(),
+        "seed": int(seed) if seed else None,
+        "timeout": float(timeout) if timeout else None,
+    }
+
+
+def configuration_name(config):
+    """ Forme textuelle d'une configuration, inverse de parse_configuration """
+    name = f"{config['encoding']}:{config['backend']}" + ("" if config.get("seed") is None else f":{config['seed']}")
+    return name + ("" if config.get("timeout") is None else f"@{config['timeout']:g}")
+
+
+def applicable(kind, configs):
+    """ Configurations dont l'encodage existe pour ce type de puzzle (lignes 2D ou piles 3D simples) """
+    encodings = ENCODINGS if kind == "2d" else Picross3D.PLAIN_ENCODINGS
+    return [config for config in configs if config["encoding"] in encodings]
+
+
+def solve_configuration(kind, puzzle, config, propagation):
+    """ Résout le puzzle avec une configuration : renvoie le statut, la solution et les durées des phases """
+    stats = Stats()
+    backend = get_backend(config["backend"], config.get("seed"))
+    if kind == "2d":
+        row_hints, col_hints = puzzle
+        grid = solve_grid(len(row_hints), len(col_hints), row_hints, col_hints, config["encoding"], propagation, backend, stats)
+        solution = None if grid is None else "\n".join(grid)
+    else:
+        solved = Picross3D.from_text(puzzle, propagation, config["encoding"], stats)
+        model = solved.solve(backend)
+        solution = None if model is None else solved.decode_solution(model)
+    return {"status": "unsat" if solution is None else "solved", "solution": solution, "timings": stats.phases}
+
+
+def worker(kind, puzzle, config, propagation, connection):
+    """ Point d'entrée d'un concurrent : résout avec sa configuration et renvoie le résultat par le tube """
+    sys.stdout = open(os.devnull, "w")
+    try:
+        result = solve_configuration(kind, puzzle, config, propagation)
+    except Exception as error:
+        result = {"status": "error", "error": repr(error)}
+    connection.send(result)
+    connection.close()
+
+
+def race(kind, puzzle, configs, timeout=60.0, propagation=True):
+    """
+    Lance chaque configuration dans son propre processus et renvoie le premier résultat définitif (solved ou unsat) :
+    les autres processus sont alors arrêtés. Une configuration est abandonnée après sa durée maximale
+    (config["timeout"], sinon timeout). puzzle est (indices des lignes, indices des colonnes) en 2D, le texte du puzzle en 3D.
+    Le résultat indique la configuration gagnante et l'issue de chacune.
+    """
+    configs = applicable(kind, configs)
+    if not configs:
+        raise ValueError(f"aucune configuration du portefeuille ne s'applique à un puzzle {kind}")
+    running = {}  # connexion -> (configuration, processus, échéance)
+    outcomes = {}
+    winner = None
+    start = time.perf_counter()
+    try:
+        for config in configs:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=worker, args=(kind, puzzle, config, propagation, sender), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (config, process, start + (config.get("timeout") or timeout))
+
+        while running and winner is None:
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            ready = wait(list(running), timeout=max(0.0, next_deadline - time.perf_counter()))
+            now = time.perf_counter()
+            for connection in list(running):
+                config, process, deadline = running[connection]
+                if connection in ready:
+                    try:
+                        result = connection.recv()
+                    except EOFError:
+                        result = {"status": "error", "error": f"le processus s'est arrêté (code {process.exitcode})"}
+                elif now >= deadline:
+                    process.terminate()
+                    result = {"status": "timeout"}
+                else:
+                    continue
+                process.join()
+                connection.close()
+                del running[connection]
+                outcomes[configuration_name(config)] = {"status": result["status"], "time": now - start}
+                if winner is None and result["status"] in ("solved", "unsat"):
+                    winner = (config, result)
+    finally:
+        # Arrêt des concurrents encore en course
+        for connection, (config, process, _) in running.items():
+            process.terminate()
+            process.join()
+            connection.close()
+            outcomes[configuration_name(config)] = {"status": "cancelled", "time": time.perf_counter() - start}
+
+    if winner is None:
+        statuses = {outcome["status"] for outcome in outcomes.values()}
+        return {"status": "timeout" if statuses == {"timeout"} else "error", "winner": None, "solution": None, "configurations": outcomes}
+    config, result = winner
+    print(f"Portefeuille : {configuration_name(config)} a gagné ({result['status']}) en {outcomes[configuration_name(config)]['time']:.3f} s", file=sys.stderr)
+    return {
+        "status": result["status"],
+        "winner": configuration_name(config),
+        "solution": result["solution"],
+        "timings": result["timings"],
+        "configurations": outcomes,
+    }
+
+
+def race_2d(row_hints, col_hints, configs=None, timeout=60.0, propagation=True):
+    """ Course sur un puzzle 2D donné par ses indices (chaînes "1 2" ou listes [1, 2]) """
+    configs = configs or [parse_configuration(name) for name in DEFAULT_PORTFOLIO["2d"]]
+    puzzle = ([format_hint(hint) for hint in row_hints], [format_hint(hint) for hint in col_hints])
+    return race("2d", puzzle, configs, timeout, propagation)
+
+
+def race_3d(text, configs=None, timeout=60.0, propagation=True):
+    """ Course sur un puzzle 3D donné par le contenu de son fichier """
+    configs = configs or [parse_configuration(name) for name in DEFAULT_PORTFOLIO["3d"]]
+    return race("3d", text, configs, timeout, propagation)
+
+
+def race_file(path, kind, configs=None, timeout=60.0, propagation=True):
+    """ Course sur un fichier de puzzle 2D ou 3D """
+    if kind == "2d":
+        _, _, row_hints, col_hints = load_hints(path)
+        return race_2d(row_hints, col_hints, configs, timeout, propagation)
+    with open(path, "r") as file:
+        return race_3d(file.read(), configs, timeout, propagation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résoudre un puzzle avec plusieurs configurations en parallèle et garder la première réponse")
+    parser.add_argument("puzzle", help="Fichier du puzzle 2D ou 3D")
+    parser.add_argument("--configs", nargs="+", default=None,
+                        help=f"Configurations encodage[:backend[:graine]][@durée] (backends : {', '.join(sorted(BACKENDS))}) ; par défaut {DEFAULT_PORTFOLIO}")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Durée maximale par configuration en secondes")
+    parser.add_argument("--no-propagation", action="store_true", help="Désactiver la propagation avant le solveur SAT")
+    args = parser.parse_args()
+
+    from batch import puzzle_kind  # Import local : batch importe ce module
+
+    kind = puzzle_kind(args.puzzle)
+    configs = [parse_configuration(text) for text in args.configs or DEFAULT_PORTFOLIO[kind]]
+    result = race_file(args.puzzle, kind, configs, args.timeout, not args.no_propagation)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
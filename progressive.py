@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Generator, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from propagation import Automaton, propagation_events
+from solvers import BackendChoice, Model, get_backend
+from stats import NULL_STATS, Stats
+
+DEFAULT_BUDGET = 1000  # Conflits de la première tranche de recherche avant un sondage des cases inconnues
+MIN_BACKBONE_TIME = 0.1  # Durée minimale (en secondes) accordée à la recherche du squelette
+
+# Un événement est un couple (case, valeur) : la case est fixée à valeur dans toutes les solutions,
+# sauf pour les derniers événements d'un puzzle à plusieurs solutions, qui complètent la solution trouvée.
+Event = Tuple[Hashable, bool]
+
+
+def stream_cells(cells: Sequence[int], clauses: Callable[[Dict[int, bool]], Iterable[List[int]]],
+                 lines: Optional[List[Tuple[Sequence[int], Automaton]]] = None, known: Optional[Dict[int, bool]] = None,
+                 backend: BackendChoice = None, stats: Stats = NULL_STATS, budget: int = DEFAULT_BUDGET,
+                 backbone: bool = True) -> Generator[Tuple[int, bool], None, Optional[Model]]:
+    """
+    Résolution progressive : produit (variable, valeur) pour chaque variable de cells dès qu'elle est prouvée,
+    puis renvoie le modèle trouvé (None si UNSAT, les événements déjà produits restant valables dans ce cas).
+    1. les cases de known, puis celles fixées par la propagation sur lines, au fil des rondes ;
+    2. la recherche SAT par tranches de budget conflits (doublé à chaque tranche) : entre deux tranches, chaque case
+       inconnue est sondée par propagation unitaire (clauses apprises comprises), un littéral en échec fixe la case
+       à l'autre valeur ;
+    3. avec backbone, les cases qui ont la même valeur dans toutes les solutions (le squelette) : un seul appel
+       suffit si la solution est unique, sinon chaque case candidate est testée sous l'hypothèse inverse. Cette
+       recherche dure au plus autant que la première (et au moins MIN_BACKBONE_TIME) : le flux coûte au plus
+       environ deux résolutions classiques, même sur un puzzle aux très nombreuses solutions.
+    Les cases restantes complètent enfin le modèle. clauses(fixed) encode les contraintes qui restent une fois
+    les cases de fixed connues. Le délai avant la première case est enregistré dans stats (phase "first_cell").
+    """
+    start = time.perf_counter()
+    counts = {"propagated": 0, "probed": 0, "backbone": 0, "completed": 0}
+    emitted: Dict[int, bool] = {}
+
+    def emit(variable, value, source):
+        if not emitted:
+            stats.add_time("first_cell", time.perf_counter() - start)
+        emitted[variable] = value
+        counts[source] += 1
+        return variable, value
+
+    try:
+        fixed = dict(known or {})
+        for variable, value in fixed.items():
+            yield emit(variable, value, "propagated")
+        if lines:
+            events = propagation_events(lines, fixed)
+            try:
+                while True:
+                    variable, value = next(events)
+                    yield emit(variable, value, "propagated")
+            except StopIteration as stop:
+                fixed = stop.value
+            if fixed is None:
+                return None
+        unknown = [variable for variable in cells if variable not in fixed]
+        if not unknown:
+            return [variable if fixed[variable] else -variable for variable in cells]
+
+        solver = get_backend(backend)
+        with solver.session(len(cells)) as session:
+            search_start = time.perf_counter()
+            with stats.phase("encode"):
+                session.add_clauses([variable if value else -variable] for variable, value in fixed.items())
+                session.add_clauses(clauses(fixed))
+            with stats.phase("solve"):
+                status, model = session.solve_limited(budget)
+            search_time = time.perf_counter() - search_start  # Durée de la recherche, sans le temps passé chez le consommateur
+            while status is None:
+                budget *= 2  # Chaque interruption a un coût : des tranches de plus en plus longues
+                proven = []
+                round_start = time.perf_counter()
+                with stats.phase("probe"):
+                    for variable in unknown:
+                        if session.failed_literal(variable):
+                            proven.append((variable, False))
+                        elif session.failed_literal(-variable):
+                            proven.append((variable, True))
+                    session.add_clauses([variable if value else -variable] for variable, value in proven)
+                with stats.phase("solve"):
+                    status, model = session.solve_limited(budget)
+                search_time += time.perf_counter() - round_start
+                for variable, value in proven:
+                    yield emit(variable, value, "probed")
+                unknown = [variable for variable in unknown if variable not in emitted]
+            if not status:
+                return None
+
+            if backbone and unknown:
+                deadline = time.perf_counter() + max(search_time, MIN_BACKBONE_TIME)
+
+                def bounded_solve(assumptions):
+                    """ solve_limited répété jusqu'à une réponse, ou (None, None) une fois deadline dépassée """
+                    with stats.phase("backbone"):
+                        while time.perf_counter() < deadline:
+                            found_status, found = session.solve_limited(budget, assumptions)
+                            if found_status is not None:
+                                return found_status, found
+                    return None, None
+
+                # Une autre solution, qui diffère du modèle sur au moins une case inconnue (sous un littéral d'activation)
+                activation = solver.num_vars + 1
+                session.add_clauses([[-activation] + [-model[variable - 1] for variable in unknown]])
+                status, other = bounded_solve([activation])
+                session.add_clauses([[-activation]])
+                if status is False:
+                    for variable in unknown:
+                        yield emit(variable, model[variable - 1] > 0, "backbone")
+                elif status:
+                    # Seules les cases de même valeur dans les deux solutions peuvent appartenir au squelette
+                    candidates = {variable for variable in unknown if other[variable - 1] == model[variable - 1]}
+                    for variable in unknown:
+                        if variable not in candidates:
+                            continue
+                        status, witness = bounded_solve([-model[variable - 1]])
+                        if status is None:
+                            break
+                        if status:
+                            candidates = {v for v in candidates if witness[v - 1] == model[v - 1]}
+                        else:
+                            session.add_clauses([[model[variable - 1]]])
+                            yield emit(variable, model[variable - 1] > 0, "backbone")
+            for variable in unknown:
+                if variable not in emitted:
+                    yield emit(variable, model[variable - 1] > 0, "completed")
+            if stats.enabled:
+                stats.solver = {"backend": solver.name, "variables": solver.num_vars, "clauses": solver.num_clauses, **solver.stats}
+        return [model[variable - 1] for variable in cells]
+    finally:
+        stats.counters.update({f"{source}_cells": count for source, count in counts.items()})
+
+
+def follow(events: Generator[Event, None, object], callback: Callable[[Hashable, bool], None]) -> object:
+    """ Transmet chaque événement d'un flux progressif à callback(case, valeur) et renvoie le résultat final du flux """
+    try:
+        while True:
+            callback(*next(events))
+    except StopIteration as stop:
+        return stop.value
+
+
+def background(events: Generator[Event, None, object]) -> "queue.Queue":
+    """
+    Consomme le flux dans un thread, pour un affichage qui ne doit jamais attendre le solveur : la file reçoit
+    chaque événement, puis (None, résultat final) à la fin du flux (résultat None si le flux a échoué).
+    """
+    updates = queue.Queue()
+
+    def run():
+        result = None
+        try:
+            result = follow(events, lambda cell, value: updates.put((cell, value)))
+        finally:
+            updates.put((None, result))
+
+    threading.Thread(target=run, daemon=True).start()
+    return updates
+
+
+def drain(updates: "queue.Queue", seconds: float) -> List[Tuple[Optional[Hashable], object]]:
+    """ Événements déjà arrivés dans la file de background, en y passant au plus seconds secondes """
+    deadline = time.perf_counter() + seconds
+    received = []
+    while time.perf_counter() < deadline:
+        try:
+            received.append(updates.get_nowait())
+        except queue.Empty:
+            break
+    return received
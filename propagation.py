@@ -0,0 +1,168 @@
+from typing import Callable, Dict, Generator, Hashable, List, Optional, Sequence, Tuple
+
+# Un automate de ligne est un triplet (état initial, transition, acceptation).
+# La transition reçoit l'état courant et la couleur de la case (True = noire) et renvoie le nouvel état,
+# ou None si la couleur est interdite à cet endroit.
+Automaton = Tuple[Hashable, Callable[[Hashable, bool], Optional[Hashable]], Callable[[Hashable], bool]]
+
+
+def nonogram_automaton(blocks: Sequence[int]) -> Automaton:
+    """ Automate d'une ligne de nonogramme 2D : les blocs, dans l'ordre, séparés par au moins une case blanche """
+    blocks = [b for b in blocks if b > 0]
+
+    def step(state, black):
+        k, run = state  # k blocs terminés, run cases noires dans le bloc courant
+        if black:
+            if k < len(blocks) and run < blocks[k]:
+                return (k, run + 1)
+            return None
+        if run == 0:
+            return state
+        if run == blocks[k]:
+            return (k + 1, 0)
+        return None
+
+    def accepting(state):
+        k, run = state
+        return (k, run) == (len(blocks), 0) or (k == len(blocks) - 1 and run == blocks[k])
+
+    return (0, 0), step, accepting
+
+
+def stack_automaton(count: int, min_groups: int, max_groups: Optional[int] = None) -> Automaton:
+    """
+    Automate d'une pile Picross 3D : exactement count blocs, répartis en un nombre de groupes compris
+    entre min_groups et max_groups (None pour "au moins min_groups").
+    """
+    cap = min_groups if max_groups is None else max_groups
+
+    def step(state, black):
+        filled, groups, previous = state
+        if not black:
+            return (filled, groups, False)
+        if filled == count:
+            return None
+        if not previous:
+            groups += 1
+            if groups > cap:
+                if max_groups is not None:
+                    return None
+                groups = cap
+        return (filled + 1, groups, True)
+
+    def accepting(state):
+        filled, groups, _ = state
+        return filled == count and groups >= min_groups
+
+    return (0, 0, False), step, accepting
+
+
+def solve_line(cells: Sequence[Optional[bool]], automaton: Automaton) -> Optional[List[Optional[bool]]]:
+    """
+    Résout une ligne : renvoie pour chaque case True / False si elle a la même couleur dans toutes les
+    solutions de la ligne compatibles avec cells, None sinon. Renvoie None si la ligne n'a aucune solution.
+    """
+    start, step, accepting = automaton
+    colors = [(True, False) if cell is None else (cell,) for cell in cells]
+
+    # Passe avant : états atteignables après chaque case
+    layers = [{start}]
+    for choices in colors:
+        layers.append({t for s in layers[-1] for c in choices for t in [step(s, c)] if t is not None})
+
+    # Passe arrière : ne garder que les transitions qui mènent à un état acceptant
+    alive = {s for s in layers[-1] if accepting(s)}
+    if not alive:
+        return None
+    result: List[Optional[bool]] = [None] * len(cells)
+    for i in range(len(cells) - 1, -1, -1):
+        possible = set()
+        previous = set()
+        for s in layers[i]:
+            for c in colors[i]:
+                if step(s, c) in alive:
+                    possible.add(c)
+                    previous.add(s)
+        alive = previous
+        result[i] = possible.pop() if len(possible) == 1 else None
+    return result
+
+
+def propagate(lines: List[Tuple[Sequence[Hashable], Automaton]], known: Optional[Dict[Hashable, bool]] = None, touched: Optional[Sequence[Hashable]] = None) -> Optional[Dict[Hashable, bool]]:
+    """
+    Applique solve_line sur toutes les lignes jusqu'au point fixe.
+    Chaque ligne est un couple (cases, automate), les cases étant des identifiants quelconques partagés entre lignes.
+    Si known est déjà un point fixe à l'exception des cases touched, seules les lignes de ces cases sont résolues d'abord.
+    Renvoie les cases fixées {case: couleur}, ou None si une ligne devient impossible.
+    """
+    events = propagation_events(lines, known, touched)
+    try:
+        while True:
+            next(events)
+    except StopIteration as stop:
+        return stop.value
+
+
+def propagation_events(lines: List[Tuple[Sequence[Hashable], Automaton]], known: Optional[Dict[Hashable, bool]] = None, touched: Optional[Sequence[Hashable]] = None) -> Generator[Tuple[Hashable, bool], None, Optional[Dict[Hashable, bool]]]:
+    """
+    Comme propagate, mais produit chaque case (case, couleur) dès qu'une ligne la fixe ; le résultat de propagate
+    est la valeur de retour du générateur (fixed = yield from propagation_events(...)).
+    """
+    fixed: Dict[Hashable, bool] = dict(known or {})
+    lines_of: Dict[Hashable, List[int]] = {}
+    for index, (cells, _) in enumerate(lines):
+        for cell in cells:
+            lines_of.setdefault(cell, []).append(index)
+
+    if touched is None:
+        pending = list(range(len(lines)))
+    else:
+        pending = sorted({index for cell in touched for index in lines_of.get(cell, [])})
+    queued = set(pending)
+    while pending:
+        index = pending.pop()
+        queued.discard(index)
+        cells, automaton = lines[index]
+        result = solve_line([fixed.get(cell) for cell in cells], automaton)
+        if result is None:
+            return None
+        for cell, color in zip(cells, result):
+            if color is not None and cell not in fixed:
+                fixed[cell] = color
+                yield cell, color
+                for other in lines_of[cell]:
+                    if other not in queued:
+                        queued.add(other)
+                        pending.append(other)
+    return fixed
+
+
+def probe(lines: List[Tuple[Sequence[Hashable], Automaton]], known: Dict[Hashable, bool], cells: Sequence[Hashable]) -> Optional[Dict[Hashable, bool]]:
+    """
+    Sondage : chaque case inconnue de cells reçoit tour à tour les deux couleurs, propagées sur lines.
+    Une couleur qui rend les lignes impossibles fixe la case à l'autre ; les cases qui prennent la même couleur
+    dans les deux essais sont fixées aussi. Recommence jusqu'au point fixe et renvoie toutes les cases fixées
+    (known compris), ou None si les lignes n'ont aucune solution.
+    """
+    fixed = propagate(lines, known)
+    changed = True
+    while changed and fixed is not None:
+        changed = False
+        for cell in cells:
+            if cell in fixed:
+                continue
+            black = propagate(lines, {**fixed, cell: True}, [cell])
+            white = propagate(lines, {**fixed, cell: False}, [cell])
+            if black is None and white is None:
+                return None
+            if black is None or white is None:
+                fixed = white if black is None else black
+            else:
+                common = {other: color for other, color in black.items() if other not in fixed and white.get(other) == color}
+                if not common:
+                    continue
+                fixed = propagate(lines, {**fixed, **common}, list(common))
+                if fixed is None:
+                    return None
+            changed = True
+    return fixed
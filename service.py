@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import sys
+import time
+
+from stats import Stats
+
+DEFAULT_SOCKET = "/tmp/picross.sock"
+LINE_LIMIT = 1 << 24  # Taille maximale d'un message JSON (les solutions 3D tiennent sur une ligne)
+
+
+def detect_kind(text):
+    """ '3d' si la première ligne donne les trois dimensions d'un Picross 3D, '2d' sinon """
+    first_line = text.lstrip().split("\n", 1)[0].split()
+    return "3d" if len(first_line) == 3 else "2d"
+
+
+class ProgressStats(Stats):
+    """ Mesures qui signalent chaque phase terminée (lecture, propagation, résolution...) à emit """
+
+    def __init__(self, emit):
+        super().__init__()
+        self.emit = emit
+
+    def add_time(self, phase, seconds):
+        super().add_time(phase, seconds)
+        self.emit({"status": "running", "phase": phase, "seconds": seconds})
+
+
+def run_worker():
+    """
+    Processus de résolution d'une tâche : lit la requête JSON sur l'entrée standard et écrit sur la sortie
+    standard une ligne JSON par phase terminée, puis le résultat.
+    """
+    out = sys.stdout
+    sys.stdout = open(os.devnull, "w")  # Les messages des solveurs ne doivent pas se mêler aux messages JSON
+
+    def emit(message):
+        out.write(json.dumps(message) + "\n")
+        out.flush()
+
+    request = json.load(sys.stdin)
+    stats = ProgressStats(emit)
+    try:
+        if request["kind"] == "2d":
+            from picross2d.picross2d import parse_hints, solve_grid
+
+            with stats.phase("parse"):
+                rows, cols, row_hints, col_hints = parse_hints(request["puzzle"])
+            solution = solve_grid(rows, cols, row_hints, col_hints, request.get("encoding", "dp"),
+                                  request.get("propagation", True), request.get("backend"), stats)
+        else:
+            from picross3d.picross3d import Picross3D
+
+            puzzle = Picross3D.from_text(request["puzzle"], request.get("propagation", True), request.get("plain_encoding", "ladder"), stats)
+            model = puzzle.solve(request.get("backend"))
+            with stats.decoding():
+                solution = None if model is None else puzzle.decode_solution(model)
+        emit({"status": "unsat" if solution is None else "solved", "solution": solution, "timings": stats.phases})
+    except Exception as error:
+        emit({"status": "error", "error": repr(error)})
+
+
+class SolverService:
+    """
+    Service de résolution : chaque connexion envoie une requête JSON d'une ligne et reçoit une ligne JSON par étape
+    (queued, running, puis solved / unsat / timeout / error / cancelled). Les tâches attendent dans une file bornée
+    et au plus workers processus résolvent en même temps ; une tâche qui dépasse son échéance voit son groupe de
+    processus tué (solveur externe compris). Fermer la connexion ou envoyer {"cancel": job} annule la tâche.
+    Les résultats sont gardés en mémoire par empreinte des indices normalisés ("cache": false pour l'ignorer).
+    """
+
+    def __init__(self, workers=os.cpu_count(), queue_size=64, timeout=60.0, cache_size=1024, cache_path=None):
+        from cache import DiskCache, MemoryCache
+
+        self.slots = asyncio.Semaphore(workers)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        # Cache persistant partagé avec les autres outils si cache_path est donné ("" : chemin par défaut)
+        self.cache = MemoryCache(cache_size) if cache_path is None else DiskCache(cache_path or None, cache_size)
+        self.waiting = 0
+        self.jobs = {}  # numéro de tâche -> tâche asyncio
+        self.job_ids = itertools.count(1)
+
+    async def handle(self, reader, writer):
+        """ Traite une connexion : une requête, puis les messages de la tâche jusqu'au résultat """
+        async def send(message):
+            writer.write((json.dumps(message) + "\n").encode())
+            await writer.drain()
+
+        try:
+            request = json.loads(await reader.readline())
+            if "cancel" in request:
+                task = self.jobs.get(request["cancel"])
+                if task is not None:
+                    task.cancel()
+                await send({"job": request["cancel"], "status": "cancelled" if task is not None else "unknown"})
+                return
+
+            job_id = next(self.job_ids)
+            task = asyncio.create_task(self.run_job(job_id, request, send))
+            self.jobs[job_id] = task
+            disconnected = asyncio.create_task(reader.read())  # b"" quand le client ferme la connexion
+            try:
+                await asyncio.wait({task, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not task.done():
+                    task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    await send({"job": job_id, "status": "cancelled"})
+                except (KeyError, ValueError, IndexError) as error:  # Requête ou puzzle mal formé
+                    await send({"job": job_id, "status": "error", "error": repr(error)})
+            finally:
+                disconnected.cancel()
+                del self.jobs[job_id]
+        except (ConnectionError, json.JSONDecodeError) as error:
+            if not writer.is_closing():
+                writer.write((json.dumps({"status": "error", "error": repr(error)}) + "\n").encode())
+        finally:
+            writer.close()
+
+    async def run_job(self, job_id, request, send):
+        """ Répond depuis le cache, ou met la tâche en file puis la résout dans un processus dédié """
+        from cache import puzzle_key
+
+        start = time.perf_counter()
+        kind = request.get("kind") or detect_kind(request["puzzle"])
+        key = puzzle_key(kind, request["puzzle"])
+        result = self.cache.get(key) if request.get("cache", True) else None
+        if result is not None:
+            await send({"job": job_id, **result, "cached": True, "wall_time": time.perf_counter() - start})
+            return
+
+        if self.waiting >= self.queue_size:
+            await send({"job": job_id, "status": "rejected", "error": "file d'attente pleine"})
+            return
+        self.waiting += 1
+        await send({"job": job_id, "status": "queued", "position": self.waiting})
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            await send({"job": job_id, "status": "running"})
+            result = await self.execute({**request, "kind": kind}, request.get("timeout", self.timeout),
+                                        lambda message: send({"job": job_id, **message}))
+        finally:
+            self.slots.release()
+        if result["status"] in ("solved", "unsat"):
+            self.cache.put(key, result)
+        await send({"job": job_id, **result, "cached": False, "wall_time": time.perf_counter() - start})
+
+    async def execute(self, request, timeout, progress):
+        """ Lance le processus de résolution, relaie ses messages de progression et le tue à l'échéance """
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "--worker",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=LINE_LIMIT,
+            start_new_session=True,  # Groupe de processus propre, pour tuer aussi gophersat
+        )
+        deadline = time.perf_counter() + timeout
+        try:
+            process.stdin.write(json.dumps(request).encode())
+            process.stdin.close()
+            while True:
+                line = await asyncio.wait_for(process.stdout.readline(), max(0.0, deadline - time.perf_counter()))
+                if not line:
+                    return {"status": "error", "error": f"le processus s'est arrêté (code {await process.wait()})"}
+                message = json.loads(line)
+                if message["status"] != "running":
+                    return message
+                await progress(message)
+        except asyncio.TimeoutError:
+            return {"status": "timeout"}
+        finally:
+            if process.returncode is None:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+
+
+async def request(payload, socket_path=DEFAULT_SOCKET, port=None):
+    """ Client : envoie une requête au service et produit ses messages jusqu'au résultat """
+    if port is None:
+        reader, writer = await asyncio.open_unix_connection(socket_path, limit=LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=LINE_LIMIT)
+    try:
+        writer.write((json.dumps(payload) + "\n").encode())
+        await writer.drain()
+        async for line in reader:
+            message = json.loads(line)
+            yield message
+            if message["status"] not in ("queued", "running"):
+                return
+    finally:
+        writer.close()
+
+
+async def serve(args):
+    service = SolverService(args.workers, args.queue_size, args.timeout, args.cache_size, args.disk_cache)
+    if args.port is None:
+        server = await asyncio.start_unix_server(service.handle, path=args.socket, limit=LINE_LIMIT)
+        print(f"Service en écoute sur {args.socket}")
+    else:
+        server = await asyncio.start_server(service.handle, "127.0.0.1", args.port, limit=LINE_LIMIT)
+        print(f"Service en écoute sur 127.0.0.1:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service local de résolution de puzzles Picross 2D / 3D (JSON ligne par ligne)")
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Socket Unix d'écoute")
+    parser.add_argument("--port", type=int, default=None, help="Écouter en TCP sur 127.0.0.1 plutôt que sur la socket Unix")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Nombre maximal de résolutions simultanées")
+    parser.add_argument("--queue-size", type=int, default=64, help="Nombre maximal de tâches en attente")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Échéance par défaut d'une tâche en secondes")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Nombre de résultats gardés en cache")
+    parser.add_argument("--disk-cache", nargs="?", const="", default=None, metavar="CHEMIN", help="Utiliser le cache persistant des solutions plutôt qu'un cache en mémoire")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker()
+        return
+    if args.port is None and os.path.exists(args.socket):
+        os.remove(args.socket)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import os
+import random
+import subprocess
+import tempfile
+import time
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Un modèle est la liste des littéraux de l'affectation trouvée (v > 0 : variable vraie, -v : variable fausse).
+Model = List[int]
+
+
+HEADER_WIDTH = 40  # Place réservée à l'en-tête DIMACS, réécrit une fois les clauses comptées
+
+
+def write_clauses(clauses: Iterable[List[int]], f: IO[str]) -> Tuple[int, int]:
+    """ Écrit les clauses au format DIMACS (sans en-tête) et renvoie (plus grande variable, nombre de clauses) """
+    max_var = 0
+    num_clauses = 0
+    for clause in clauses:
+        max_var = max(max_var, max(map(abs, clause), default=0))
+        num_clauses += 1
+        f.write(" ".join(map(str, clause)) + " 0\n")
+    return max_var, num_clauses
+
+
+def write_dimacs(clauses: Iterable[List[int]], f: IO[str], num_vars: int = 0) -> Tuple[int, int]:
+    """
+    Écrit les clauses au fil de l'eau au format DIMACS et renvoie (nombre de variables, nombre de clauses).
+    L'en-tête est réservé puis corrigé à la fin, ce qui demande un fichier où l'on peut revenir en arrière.
+    """
+    header_pos = f.tell()
+    f.write(" " * (HEADER_WIDTH - 1) + "\n")
+    max_var, num_clauses = write_clauses(clauses, f)
+    num_vars = max(num_vars, max_var)
+    rewrite_dimacs_header(f, header_pos, num_vars, num_clauses)
+    return num_vars, num_clauses
+
+
+def rewrite_dimacs_header(f: IO[str], header_pos: int, num_vars: int, num_clauses: int) -> None:
+    """ Réécrit l'en-tête réservé par write_dimacs et revient à la fin du fichier """
+    end_pos = f.tell()
+    f.seek(header_pos)
+    f.write(f"p cnf {num_vars} {num_clauses}".ljust(HEADER_WIDTH - 1))
+    f.seek(end_pos)
+
+
+def blocking_clause(model: Model, projection: Iterable[int]) -> List[int]:
+    """ Clause interdisant de retrouver les mêmes valeurs que model sur les variables de projection """
+    return [-model[v - 1] for v in projection]
+
+
+def timed_clauses(clauses: Iterable[List[int]], timings: Dict[str, float], key: str) -> Iterator[List[int]]:
+    """ Transmet le flux de clauses en cumulant dans timings[key] le temps passé à les produire """
+    timings.setdefault(key, 0.0)
+    iterator = iter(clauses)
+    while True:
+        start = time.perf_counter()
+        clause = next(iterator, None)
+        timings[key] += time.perf_counter() - start
+        if clause is None:
+            return
+        yield clause
+
+
+class SolverSession:
+    """
+    Formule gardée ouverte entre plusieurs résolutions : des clauses peuvent être ajoutées après chaque appel
+    à solve(), qui repart de l'état courant du solveur sans réencoder ce qui a déjà été transmis.
+    solve(assumptions) résout en supposant vrais ces littéraux pour cet appel seulement (littéraux d'activation).
+    solve_limited et failed_literal servent à la résolution progressive (voir progressive.stream_cells).
+    Les tailles (num_vars, num_clauses) et les statistiques sont tenues à jour sur le backend.
+    """
+
+    def __init__(self, backend: "SolverBackend", num_vars: int = 0):
+        self.backend = backend
+        backend.num_vars = num_vars
+        backend.num_clauses = 0
+
+    def add_clauses(self, clauses: Iterable[List[int]]) -> None:
+        raise NotImplementedError
+
+    def solve(self, assumptions: Sequence[int] = ()) -> Optional[Model]:
+        raise NotImplementedError
+
+    def solve_limited(self, conflicts: int, assumptions: Sequence[int] = ()) -> Tuple[Optional[bool], Optional[Model]]:
+        """
+        Résout en s'arrêtant après environ conflicts conflits : renvoie (True, modèle), (False, None) si UNSAT,
+        ou (None, None) si le budget est épuisé (rappeler solve_limited reprend avec les clauses apprises).
+        Par défaut, la résolution va jusqu'au bout.
+        """
+        model = self.solve(assumptions)
+        return model is not None, model
+
+    def failed_literal(self, literal: int) -> bool:
+        """ True si la propagation unitaire de literal sur la formule (clauses apprises comprises) aboutit à un conflit """
+        return False
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "SolverSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def complete(self, model: Model) -> Model:
+        """ Complète les variables absentes des clauses pour avoir un littéral par variable """
+        return model + [-v for v in range(len(model) + 1, self.backend.num_vars + 1)]
+
+
+class SolverBackend:
+    """
+    Interface commune des solveurs SAT : consomme un flux de clauses et renvoie un modèle, ou None si UNSAT.
+    Les clauses ne sont jamais rassemblées en liste ; num_vars et num_clauses sont connus après la résolution.
+    """
+    name = ""
+
+    def __init__(self):
+        self.num_vars = 0
+        self.num_clauses = 0
+        self.stats: Dict[str, int] = {}  # Statistiques rapportées par le solveur (conflits, décisions...)
+        self.seed: Optional[int] = None  # Graine de diversification, ignorée par les solveurs qui ne la prennent pas en charge
+
+    def session(self, num_vars: int = 0) -> SolverSession:
+        """ Ouvre une formule vide, à compléter et résoudre autant de fois que nécessaire """
+        raise NotImplementedError
+
+    def solve(self, clauses: Iterable[List[int]], num_vars: int = 0) -> Optional[Model]:
+        models = self.enumerate(clauses, num_vars, [], 1)
+        return models[0] if models else None
+
+    def enumerate(self, clauses: Iterable[List[int]], num_vars: int, projection: Iterable[int], limit: int) -> List[Model]:
+        """
+        Renvoie jusqu'à limit modèles différents sur les variables de projection : après chaque modèle, une clause
+        de blocage est ajoutée et le solveur repart de son état courant, sans réencoder les clauses.
+        """
+        projection = list(projection)
+        models: List[Model] = []
+        with self.session(num_vars) as session:
+            session.add_clauses(clauses)
+            num_clauses = self.num_clauses  # Les clauses de blocage ne sont pas comptées
+            while len(models) < limit:
+                model = session.solve()
+                if model is None:
+                    break
+                models.append(model)
+                if len(models) < limit:
+                    session.add_clauses([blocking_clause(model, projection)])
+        self.num_clauses = num_clauses
+        return models
+
+
+class GophersatSession(SolverSession):
+    """
+    gophersat n'est pas incrémental : les clauses sont ajoutées à un fichier DIMACS temporaire
+    dont l'en-tête est réécrit avant chaque appel de l'exécutable. Les hypothèses sont ajoutées en clauses
+    unitaires le temps de l'appel, puis retirées du fichier.
+    """
+
+    def __init__(self, backend: "GophersatBackend", num_vars: int = 0):
+        super().__init__(backend, num_vars)
+        fd, self.filename = tempfile.mkstemp(suffix=".cnf")
+        self.file = os.fdopen(fd, "w", buffering=1 << 16)
+        self.file.write(" " * (HEADER_WIDTH - 1) + "\n")
+
+    def add_clauses(self, clauses: Iterable[List[int]]) -> None:
+        max_var, num_clauses = write_clauses(clauses, self.file)
+        self.backend.num_vars = max(self.backend.num_vars, max_var)
+        self.backend.num_clauses += num_clauses
+
+    def solve(self, assumptions: Sequence[int] = ()) -> Optional[Model]:
+        end_pos = self.file.tell()
+        for literal in assumptions:
+            self.file.write(f"{literal} 0\n")
+        num_vars = max([self.backend.num_vars] + [abs(literal) for literal in assumptions])
+        rewrite_dimacs_header(self.file, 0, num_vars, self.backend.num_clauses + len(assumptions))
+        self.file.flush()
+        try:
+            result = subprocess.run([self.backend.executable, self.filename], capture_output=True, text=True)
+        finally:
+            self.file.seek(end_pos)
+            self.file.truncate()
+        model = parse_dimacs_output(result.stdout, result.stderr)
+        return None if model is None else self.complete(model)
+
+    def close(self) -> None:
+        self.file.close()
+        os.remove(self.filename)
+
+
+class GophersatBackend(SolverBackend):
+    """ Appelle l'exécutable gophersat sur un fichier DIMACS temporaire propre à chaque résolution """
+    name = "gophersat"
+
+    def __init__(self, executable: str = "gophersat"):
+        super().__init__()
+        self.executable = executable
+
+    def session(self, num_vars: int = 0) -> SolverSession:
+        return GophersatSession(self, num_vars)
+
+
+class PySATSession(SolverSession):
+    """ Solveur PySAT gardé en mémoire : les clauses apprises sont conservées d'une résolution à l'autre """
+
+    def __init__(self, backend: "PySATBackend", num_vars: int = 0):
+        super().__init__(backend, num_vars)
+        from pysat.solvers import Solver  # Import paresseux : dépendance optionnelle
+
+        self.solver = Solver(name=backend.solver_name)
+        self.phases_set = backend.seed is None
+
+    def add_clauses(self, clauses: Iterable[List[int]]) -> None:
+        for clause in clauses:
+            self.solver.add_clause(clause)
+            self.backend.num_clauses += 1
+        self.backend.num_vars = max(self.backend.num_vars, self.solver.nof_vars())
+
+    def solve(self, assumptions: Sequence[int] = ()) -> Optional[Model]:
+        self.set_phases()
+        satisfiable = self.solver.solve(assumptions=list(assumptions))
+        self.backend.stats = self.solver.accum_stats() or {}
+        if not satisfiable:
+            return None
+        return self.complete(self.solver.get_model() or [])
+
+    def solve_limited(self, conflicts: int, assumptions: Sequence[int] = ()) -> Tuple[Optional[bool], Optional[Model]]:
+        self.set_phases()
+        self.solver.conf_budget(conflicts)
+        status = self.solver.solve_limited(assumptions=list(assumptions))
+        self.backend.stats = self.solver.accum_stats() or {}
+        return status, self.complete(self.solver.get_model() or []) if status else None
+
+    def failed_literal(self, literal: int) -> bool:
+        return not self.solver.propagate(assumptions=[literal])[0]
+
+    def set_phases(self) -> None:
+        if not self.phases_set:
+            # La graine fixe des polarités initiales aléatoires : chaque graine explore l'espace dans un autre ordre
+            rng = random.Random(self.backend.seed)
+            self.solver.set_phases([v if rng.random() < 0.5 else -v for v in range(1, self.backend.num_vars + 1)])
+            self.phases_set = True
+
+    def close(self) -> None:
+        self.solver.delete()
+
+
+class PySATBackend(SolverBackend):
+    """ Solveur CDCL en mémoire via PySAT (pip install python-sat), sans fichier ni processus externe """
+    name = "pysat"
+
+    def __init__(self, solver_name: str = "cadical153"):
+        super().__init__()
+        self.solver_name = solver_name
+
+    def session(self, num_vars: int = 0) -> SolverSession:
+        return PySATSession(self, num_vars)
+
+
+def parse_dimacs_output(stdout: str, stderr: str = "") -> Optional[Model]:
+    """ Lit la sortie au format de la compétition SAT (lignes "s ..." et "v ...") """
+    status = None
+    model: Model = []
+    for line in stdout.splitlines():
+        if line.startswith("s "):
+            status = line[2:].strip()
+        elif line.startswith("v "):
+            model.extend(int(lit) for lit in line.split()[1:] if lit != "0")
+    if status == "UNSATISFIABLE":
+        return None
+    if status != "SATISFIABLE":
+        raise RuntimeError(f"Réponse inattendue du solveur : {stdout.strip() or stderr.strip()}")
+    return model
+
+
+BACKENDS: Dict[str, type] = {
+    GophersatBackend.name: GophersatBackend,
+    PySATBackend.name: PySATBackend,
+}
+
+
+def default_backend_name() -> str:
+    """ PySAT si la bibliothèque est installée, gophersat sinon """
+    try:
+        import pysat.solvers  # noqa: F401
+    except ImportError:
+        return GophersatBackend.name
+    return PySATBackend.name
+
+
+BackendChoice = Union[str, SolverBackend, None]  # Nom de backend, instance déjà configurée, ou None pour le défaut
+
+
+def get_backend(name: BackendChoice = None, seed: Optional[int] = None) -> SolverBackend:
+    """ Instancie le backend demandé (par défaut celui de default_backend_name) ; une instance est renvoyée telle quelle """
+    if isinstance(name, SolverBackend):
+        return name
+    backend = BACKENDS[name or default_backend_name()]()
+    backend.seed = seed
+    return backend
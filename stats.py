@@ -0,0 +1,167 @@
+import heapq
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from solvers import Model, SolverBackend, timed_clauses
+
+
+class Stats:
+    """
+    Mesures d'une résolution, partagées par les solveurs 2D et 3D : durée de chaque phase, clauses et variables
+    par type d'indice, lignes / piles les plus coûteuses et statistiques rapportées par le solveur SAT.
+    """
+    enabled = True
+
+    def __init__(self, top: int = 10):
+        self.top = top  # Nombre de lignes / piles les plus coûteuses à conserver
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.clue_types: Dict[str, Dict[str, int]] = {}
+        self.largest: List[tuple] = []  # Tas des (clauses, variables, étiquette) les plus gros
+        self.solver: Dict[str, object] = {}
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """ Chronomètre le bloc et ajoute sa durée à la phase name """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    @contextmanager
+    def decoding(self):
+        """
+        Chronomètre le bloc dans la phase "decode". Le premier chargement de grids (et donc de NumPy) est compté à part,
+        dans la phase "import" : sans cela, le premier décodage d'un processus paraîtrait bien plus lent qu'il ne l'est.
+        """
+        if "grids" not in sys.modules:
+            with self.phase("import"):
+                import grids  # noqa: F401
+        with self.phase("decode"):
+            yield
+
+    def track(self, clauses: Iterable[List[int]], clue_type: str, label: str, variables: Callable[[], int]) -> Iterator[List[int]]:
+        """
+        Transmet les clauses d'une ligne / pile en comptant ses clauses et les variables qu'elle crée
+        (variables() renvoie le nombre courant de variables).
+        """
+        first_variable = variables()
+        num_clauses = 0
+        for clause in clauses:
+            num_clauses += 1
+            yield clause
+        num_variables = variables() - first_variable
+
+        totals = self.clue_types.setdefault(clue_type, {"lines": 0, "clauses": 0, "variables": 0})
+        totals["lines"] += 1
+        totals["clauses"] += num_clauses
+        totals["variables"] += num_variables
+        entry = (num_clauses, num_variables, f"{clue_type} {label}")
+        if len(self.largest) < self.top:
+            heapq.heappush(self.largest, entry)
+        else:
+            heapq.heappushpop(self.largest, entry)
+
+    def run_solver(self, solver: SolverBackend, clauses: Iterable[List[int]], num_vars: int = 0) -> Optional[Model]:
+        """ Résout en séparant le temps de génération des clauses ("encode") du temps propre au solveur ("solve") """
+        models = self.run_enumeration(solver, clauses, num_vars, [], 1)
+        return models[0] if models else None
+
+    def run_enumeration(self, solver: SolverBackend, clauses: Iterable[List[int]], num_vars: int,
+                        projection: Iterable[int], limit: int) -> List[Model]:
+        """ Comme run_solver, pour SolverBackend.enumerate ; le nombre de modèles trouvés est compté dans "models" """
+        encode_before = self.phases.get("encode", 0.0)
+        start = time.perf_counter()
+        models = solver.enumerate(timed_clauses(clauses, self.phases, "encode"), num_vars, projection, limit)
+        self.add_time("solve", time.perf_counter() - start - (self.phases["encode"] - encode_before))
+        self.solver = {"backend": solver.name, "variables": solver.num_vars, "clauses": solver.num_clauses, **solver.stats}
+        if limit > 1:
+            self.counters["models"] = len(models)
+        return models
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "phases": self.phases,
+            "counters": self.counters,
+            "clue_types": self.clue_types,
+            "largest": [{"line": label, "clauses": c, "variables": v} for c, v, label in sorted(self.largest, reverse=True)],
+            "solver": self.solver,
+        }
+
+    def report(self, fmt: str = "text") -> str:
+        """ Rapport des mesures au format "json" ou "text" """
+        if fmt == "json":
+            return json.dumps(self.as_dict(), indent=2)
+        lines = ["Phases :"]
+        lines += [f"  {name:<14}{seconds:10.4f} s" for name, seconds in self.phases.items()]
+        lines += [f"  {name:<14}{value:10}" for name, value in self.counters.items()]
+        lines.append("Clauses / variables par type d'indice :")
+        lines += [f"  {name:<14}{t['lines']:6} lignes {t['clauses']:10} clauses {t['variables']:10} variables" for name, t in self.clue_types.items()]
+        lines.append("Lignes les plus coûteuses :")
+        lines += [f"  {label:<30}{c:10} clauses {v:10} variables" for c, v, label in sorted(self.largest, reverse=True)]
+        lines.append("Solveur : " + ", ".join(f"{key}={value}" for key, value in self.solver.items()))
+        return "\n".join(lines)
+
+
+class NullStats(Stats):
+    """
+    Mesures désactivées : chaque méthode laisse passer le flux sans le chronométrer ni le compter.
+    NULL_STATS est partagé par tout le processus : ses dictionnaires sont jetables (un nouveau à chaque lecture,
+    les affectations sont ignorées), pour que les écritures directes (stats.counters[...] = ...) ne s'accumulent pas.
+    """
+    enabled = False
+
+    def __init__(self, top: int = 10):
+        self.top = top
+
+    def discard(name: str, empty: Callable[[], object]) -> property:
+        return property(lambda self: empty(), lambda self, value: None, doc=f"{name} jetable")
+
+    phases = discard("phases", dict)
+    counters = discard("counters", dict)
+    clue_types = discard("clue_types", dict)
+    largest = discard("largest", list)
+    solver = discard("solver", dict)
+    del discard
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        pass
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def track(self, clauses, clue_type, label, variables):
+        return clauses
+
+    def run_solver(self, solver, clauses, num_vars=0):
+        return solver.solve(clauses, num_vars)
+
+    def run_enumeration(self, solver, clauses, num_vars, projection, limit):
+        return solver.enumerate(clauses, num_vars, projection, limit)
+
+
+NULL_STATS = NullStats()
+
+
+@contextmanager
+def profiled(filename: Optional[str]):
+    """ Enregistre un profil cProfile du bloc dans filename (rien si filename est None) """
+    if filename is None:
+        yield
+        return
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(filename)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules du projet s'importent depuis la racine du dépôt (comme benchmark.py ou batch.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,27 @@
+import glob
+import os
+
+import pytest
+
+from picross2d.picross2d import ENCODINGS, load_hints, solve_grid
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+INPUTS_2D = sorted(glob.glob(os.path.join(DATA, "inputs-2D", "*.txt")))
+
+# Sans propagation, placement met 30 à 60 s sur ces grilles : elles gardent la propagation pour cet encodage
+SLOW_RAW_PLACEMENT = {"helicopter.txt", "horse.txt"}
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODINGS))
+@pytest.mark.parametrize("filename", INPUTS_2D, ids=os.path.basename)
+def test_encodings_match_reference_solution(filename, encoding):
+    """
+    Chaque encodage des indices 2D retrouve la solution de data/outputs-2D. La propagation résout seule cactus et
+    helicopter : la CNF est donc résolue telle quelle, sans propagation, sauf pour placement sur les grandes grilles.
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    with open(os.path.join(DATA, "outputs-2D", f"{name}_solution.txt")) as file:
+        expected = [line.strip() for line in file if line.strip()]
+    rows, cols, row_hints, col_hints = load_hints(filename)
+    propagation = encoding == "placement" and os.path.basename(filename) in SLOW_RAW_PLACEMENT
+    assert solve_grid(rows, cols, row_hints, col_hints, encoding, propagation) == expected
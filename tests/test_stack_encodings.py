@@ -0,0 +1,45 @@
+import itertools
+
+import pytest
+
+from picross3d.picross3d import Picross3D
+from solvers import get_backend
+
+LENGTHS = range(1, 9)
+
+
+def groups(assignment):
+    """ Nombre de groupes de blocs présents consécutifs """
+    return sum(1 for present, _ in itertools.groupby(assignment) if present)
+
+
+def expected_assignments(length, clue, sideNum):
+    """ Affectations de la pile qui respectent l'indice, par énumération exhaustive """
+    allowed = {"plain": lambda n: n <= 1, "circle": lambda n: n == 2, "square": lambda n: n >= 3}[clue]
+    return {assignment for assignment in itertools.product((False, True), repeat=length)
+            if sum(assignment) == sideNum and allowed(groups(assignment))}
+
+
+def stack_puzzle(length):
+    """ Puzzle length x 1 x 1 sans indice : sa seule pile de la face 0 porte les variables 1 à length """
+    text = f"{length} 1 1\n\n-\n\n" + "-\n" * length + "\n" + " ".join("-" * length) + "\n"
+    puzzle = Picross3D.from_text(text, propagation=False)
+    return puzzle, puzzle.get_stack_of_blocks(0, 0, 0)
+
+
+@pytest.mark.parametrize("condition, clue", [
+    ("PlainStackCondition", "plain"),
+    ("LadderStackCondition", "plain"),
+    ("CircleStackCondition", "circle"),
+    ("SquareStackCondition", "square"),
+])
+@pytest.mark.parametrize("length", LENGTHS)
+def test_stack_condition_models_match_brute_force(condition, clue, length):
+    """ Les modèles SAT de chaque encodage, projetés sur la pile, sont exactement les affectations valides """
+    for sideNum in range(length + 2):  # length + 1 : indice trop grand pour la pile, aucun modèle
+        puzzle, stack = stack_puzzle(length)
+        clauses = list(getattr(puzzle, condition)(stack, sideNum))
+        models = get_backend("pysat").enumerate(clauses, puzzle.numLiterals - 1, stack, 2 ** length + 1)
+        found = {tuple(model[block - 1] > 0 for block in stack) for model in models}
+        assert len(found) == len(models), "un modèle est compté deux fois"
+        assert found == expected_assignments(length, clue, sideNum), (condition, length, sideNum)